@@ -1,14 +1,24 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
+import hashlib
+import json
 from pathlib import Path
 import sqlite3
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Iterator, Optional
 
-from fastapi import FastAPI, Query, HTTPException
-from fastapi.responses import HTMLResponse, PlainTextResponse
+from fastapi import FastAPI, Query, HTTPException, Request
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response
+
+try:
+    import orjson
+except ImportError:  # declared in pyproject; stdlib json only for bare (non-poetry) installs
+    orjson = None
 
 from travel_tracker.storage.db import SQLITE_PATH
+from travel_tracker.storage.pool import get_conn, open_writer
 
 
 APP_TITLE = "travel_price_tracker API"
@@ -17,28 +27,70 @@ DB_PATH = Path(SQLITE_PATH)
 app = FastAPI(title=APP_TITLE)
 
 
-def _conn() -> sqlite3.Connection:
+@contextmanager
+def _conn() -> Iterator[sqlite3.Connection]:
     if not DB_PATH.exists():
         raise HTTPException(status_code=500, detail=f"DB not found: {DB_PATH}")
-    c = sqlite3.connect(str(DB_PATH))
-    c.row_factory = sqlite3.Row
-    return c
+    # 連線來自 storage.pool（重複使用，不要 close）
+    with get_conn() as c:
+        yield c
 
 
-def _date_floor(days: int) -> str:
+_SIGNAL_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS ix_signals_news_city_date ON signals_news(city_code, run_date, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_signals_weather_city_date ON signals_weather(city_code, run_date, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_signals_safety_city_date ON signals_safety(city_code, run_date, id DESC)",
+)
+
+
+@app.on_event("startup")
+def _ensure_indexes() -> None:
+    # /signals/* 都是 city_code = ? and run_date >= ? order by id desc：用複合索引避免全表掃描
+    if not DB_PATH.exists():
+        return
+    # pool 的連線是 query_only，建索引要用獨立的 writer
+    c = open_writer(DB_PATH)
+    try:
+        for sql in _SIGNAL_INDEXES:
+            try:
+                c.execute(sql)
+            except sqlite3.OperationalError:
+                # table not created yet (daily never ran)
+                pass
+        c.commit()
+    finally:
+        c.close()
+
+
+def _dumps(obj: object) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _rows_response(cur: sqlite3.Cursor, **meta: object) -> Response:
+    # 直接把 cursor 結果編成 JSON bytes，略過 FastAPI 的 jsonable_encoder
+    cols = [d[0] for d in cur.description]
+    rows = [dict(zip(cols, r)) for r in cur.fetchall()]
+    return Response(content=_dumps({**meta, "count": len(rows), "rows": rows}), media_type="application/json")
+
+
+@lru_cache(maxsize=128)
+def _floor_for(days: int, today_ord: int) -> str:
     # run_date 是 'YYYY-MM-DD'，用字串比較可行（同格式）
-    d = datetime.now() - timedelta(days=days)
-    return d.strftime("%Y-%m-%d")
+    return (date.fromordinal(today_ord) - timedelta(days=days)).isoformat()
+
+
+def _date_floor(days: int) -> str:
+    # 以「今天」的 ordinal 當 cache key：同一天內不重算 strftime/timedelta
+    return _floor_for(days, date.today().toordinal())
 
 
 @app.get("/health")
 def health() -> dict:
     try:
-        c = _conn()
-        try:
+        with _conn() as c:
             c.execute("select 1").fetchone()
-        finally:
-            c.close()
     except Exception as e:
         return {"ok": False, "db": str(DB_PATH), "error": repr(e)}
 
@@ -58,10 +110,9 @@ def signals_news(
     days: int = Query(7, ge=1, le=90),
     limit: int = Query(50, ge=1, le=500),
     source_id: Optional[str] = Query(None),
-) -> dict:
+) -> Response:
     floor = _date_floor(days)
-    c = _conn()
-    try:
+    with _conn() as c:
         sql = """
         select id, run_date, city_code, city_name_zh, source_id, source, title, url, published_at, created_at
         from signals_news
@@ -76,10 +127,7 @@ def signals_news(
         sql += " order by id desc limit ? "
         params.append(limit)
 
-        rows = [dict(r) for r in c.execute(sql, params).fetchall()]
-        return {"city": city, "days": days, "limit": limit, "count": len(rows), "rows": rows}
-    finally:
-        c.close()
+        return _rows_response(c.execute(sql, params), city=city, days=days, limit=limit)
 
 
 @app.get("/signals/weather")
@@ -87,11 +135,10 @@ def signals_weather(
     city: str = Query(...),
     days: int = Query(7, ge=1, le=90),
     limit: int = Query(50, ge=1, le=500),
-) -> dict:
+) -> Response:
     floor = _date_floor(days)
-    c = _conn()
-    try:
-        rows = [dict(r) for r in c.execute(
+    with _conn() as c:
+        cur = c.execute(
             """
             select id, run_date, city_code, city_name_zh, source_id, source, title, url, published_at, created_at
             from signals_weather
@@ -101,10 +148,8 @@ def signals_weather(
             limit ?
             """,
             (city, floor, limit),
-        ).fetchall()]
-        return {"city": city, "days": days, "limit": limit, "count": len(rows), "rows": rows}
-    finally:
-        c.close()
+        )
+        return _rows_response(cur, city=city, days=days, limit=limit)
 
 
 @app.get("/signals/safety")
@@ -112,11 +157,10 @@ def signals_safety(
     city: str = Query(...),
     days: int = Query(30, ge=1, le=365),
     limit: int = Query(50, ge=1, le=500),
-) -> dict:
+) -> Response:
     floor = _date_floor(days)
-    c = _conn()
-    try:
-        rows = [dict(r) for r in c.execute(
+    with _conn() as c:
+        cur = c.execute(
             """
             select id, run_date, city_code, city_name_zh, source_id, source, title, url, published_at, created_at
             from signals_safety
@@ -126,17 +170,14 @@ def signals_safety(
             limit ?
             """,
             (city, floor, limit),
-        ).fetchall()]
-        return {"city": city, "days": days, "limit": limit, "count": len(rows), "rows": rows}
-    finally:
-        c.close()
+        )
+        return _rows_response(cur, city=city, days=days, limit=limit)
 
 
 @app.get("/runs")
-def runs(limit: int = Query(30, ge=1, le=500)) -> dict:
-    c = _conn()
-    try:
-        rows = [dict(r) for r in c.execute(
+def runs(limit: int = Query(30, ge=1, le=500)) -> Response:
+    with _conn() as c:
+        cur = c.execute(
             """
             select *
             from runs
@@ -144,24 +185,40 @@ def runs(limit: int = Query(30, ge=1, le=500)) -> dict:
             limit ?
             """,
             (limit,),
-        ).fetchall()]
-        return {"limit": limit, "count": len(rows), "rows": rows}
-    finally:
-        c.close()
+        )
+        return _rows_response(cur, limit=limit)
+
+
+# (mtime_ns, size, body) of reports/latest.md
+_latest_cache: tuple[int, int, bytes] | None = None
 
 
 @app.get("/reports/latest", response_class=PlainTextResponse)
-def reports_latest() -> str:
+def reports_latest(request: Request) -> Response:
+    global _latest_cache
     p = Path("reports/latest.md")
-    if not p.exists():
+    try:
+        st = p.stat()
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="reports/latest.md not found")
-    return p.read_text(encoding="utf-8")
 
+    # 檔案沒變（mtime+size 相同）就不重讀；瀏覽器帶 If-None-Match 直接回 304
+    etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
 
-@app.get("/ui", response_class=HTMLResponse)
-def ui() -> str:
-    # 最小展示頁：選城市 + 直接看 news
-    return """
+    cached = _latest_cache
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        body = cached[2]
+    else:
+        body = p.read_bytes()
+        _latest_cache = (st.st_mtime_ns, st.st_size, body)
+    return Response(content=body, media_type="text/plain; charset=utf-8", headers=headers)
+
+
+# 最小展示頁：選城市 + 直接看 news（import 時編碼一次，之後每次直接回 bytes）
+_UI_HTML = """
 <!doctype html>
 <html lang="zh-Hant">
 <head>
@@ -264,5 +321,13 @@ async function loadLatest(){
 </body>
 </html>
 """
+_UI_BYTES = _UI_HTML.encode("utf-8")
+_UI_ETAG = f'"{hashlib.blake2b(_UI_BYTES, digest_size=8).hexdigest()}"'
+_UI_HEADERS = {"ETag": _UI_ETAG, "Cache-Control": "public, max-age=3600"}
 
 
+@app.get("/ui", response_class=HTMLResponse)
+def ui(request: Request) -> Response:
+    if request.headers.get("if-none-match") == _UI_ETAG:
+        return Response(status_code=304, headers=_UI_HEADERS)
+    return Response(content=_UI_BYTES, media_type="text/html; charset=utf-8", headers=_UI_HEADERS)
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Callable, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def arun_per_host(
+    jobs: Sequence[T],
+    host_of: Callable[[T], str],
+    fn: Callable[[T], R],
+    max_concurrency: int = 8,
+    per_host: int = 1,
+) -> list[R]:
+    """
+    Run blocking fn(job) for every job in worker threads.
+    - same host: at most per_host jobs in flight (default 1, politeness)
+    - different hosts: up to max_concurrency in parallel
+    Results keep input order; the first exception raised by fn propagates.
+    """
+    sem = asyncio.Semaphore(max_concurrency)
+    host_sems: dict[str, asyncio.Semaphore] = {}
+
+    async def one(job: T) -> R:
+        host = host_of(job)
+        host_sem = host_sems.get(host)
+        if host_sem is None:
+            host_sem = host_sems[host] = asyncio.Semaphore(per_host)
+        async with host_sem, sem:
+            return await asyncio.to_thread(fn, job)
+
+    return await asyncio.gather(*(one(j) for j in jobs))
+
+
+def run_per_host(
+    jobs: Sequence[T],
+    host_of: Callable[[T], str],
+    fn: Callable[[T], R],
+    max_concurrency: int = 8,
+    per_host: int = 1,
+) -> list[R]:
+    return asyncio.run(arun_per_host(jobs, host_of, fn, max_concurrency=max_concurrency, per_host=per_host))
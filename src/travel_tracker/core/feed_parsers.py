@@ -1,10 +1,47 @@
 from __future__ import annotations
 
+import io
+import re
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from email.utils import parsedate_to_datetime
-from typing import Optional
-from xml.etree import ElementTree as ET
+from functools import lru_cache
+from typing import Iterator, Optional
+
+try:
+    # libxml2 (C) parser, declared in pyproject; same ElementTree API.
+    # stdlib fallback only for bare (non-poetry) installs
+    from lxml import etree as ET
+    _HAS_LXML = True
+except ImportError:
+    from xml.etree import ElementTree as ET
+    _HAS_LXML = False
+
+# bodies larger than this are parsed incrementally (iterparse) instead of building a full DOM
+STREAM_THRESHOLD = 64 * 1024
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+ATOM_ENTRY = f"{ATOM_NS}entry"
+ATOM_TITLE = f"{ATOM_NS}title"
+ATOM_LINK = f"{ATOM_NS}link"
+ATOM_UPDATED = f"{ATOM_NS}updated"
+ATOM_PUBLISHED = f"{ATOM_NS}published"
+DC_DATE = "{http://purl.org/dc/elements/1.1/}date"
+# RSS 1.0 (RDF): <item>s and their children live in this namespace
+RSS1_NS = "{http://purl.org/rss/1.0/}"
+RSS1_ITEM = f"{RSS1_NS}item"
+
+# child tag -> field name, for the single pass over an RSS <item> (2.0 or 1.0/RDF)
+_RSS_FIELDS = {
+    "title": "title",
+    "link": "link",
+    "pubDate": "pub",
+    DC_DATE: "date",
+    f"{RSS1_NS}title": "title",
+    f"{RSS1_NS}link": "link",
+}
+_RSS_ITEM_TAGS = frozenset({"item", RSS1_ITEM})
+_ATOM_FIELDS = {ATOM_TITLE: "title", ATOM_UPDATED: "updated", ATOM_PUBLISHED: "published"}
 
 
 @dataclass
@@ -15,11 +52,20 @@ class FeedItem:
 
 
 def _strip_ns(tag: str) -> str:
+    if not isinstance(tag, str):
+        # lxml: comments / processing instructions
+        return ""
     if "}" in tag:
         return tag.split("}", 1)[1]
     return tag
 
 
+@lru_cache(maxsize=512)
+def _localname(tag: str) -> str:
+    # "{ns}Tag" -> "tag"; feeds reuse a handful of tag strings, so resolve each once
+    return _strip_ns(tag).lower()
+
+
 def _txt(el: Optional[ET.Element]) -> str:
     if el is None or el.text is None:
         return ""
@@ -29,20 +75,39 @@ def _txt(el: Optional[ET.Element]) -> str:
 def _find_child(el: ET.Element, localname: str) -> Optional[ET.Element]:
     ln = localname.lower()
     for c in list(el):
-        if _strip_ns(c.tag).lower() == ln:
+        if _localname(c.tag) == ln:
             return c
     return None
 
 
 def _find_children(el: ET.Element, localname: str) -> list[ET.Element]:
     ln = localname.lower()
-    return [c for c in list(el) if _strip_ns(c.tag).lower() == ln]
+    return [c for c in list(el) if _localname(c.tag) == ln]
+
+
+# most common Atom shape: 2025-12-15T01:02:03Z
+_ISO_Z_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})Z")
+
+
+def _fast_iso_z(s: str) -> datetime | None:
+    m = _ISO_Z_RE.fullmatch(s)
+    if m is None:
+        return None
+    try:
+        return datetime(*map(int, m.groups()), tzinfo=timezone.utc)
+    except ValueError:
+        return None
 
 
+# feeds repeat the same timestamp strings a lot; both parsers are pure -> memoize
+@lru_cache(maxsize=4096)
 def _parse_time(s: str) -> str | None:
     s = (s or "").strip()
     if not s:
         return None
+    dt = _fast_iso_z(s)
+    if dt is not None:
+        return dt.isoformat(timespec="seconds")
     try:
         dt = parsedate_to_datetime(s)
         return dt.isoformat(timespec="seconds")
@@ -55,39 +120,146 @@ def _parse_time(s: str) -> str | None:
         return None
 
 
-def parse_rss_or_atom(xml_bytes: bytes) -> list[FeedItem]:
-    import xml.etree.ElementTree as ET
-    from datetime import datetime
-    from email.utils import parsedate_to_datetime
-
-    def strip_ns(tag: str) -> str:
-        return tag.split("}", 1)[-1] if "}" in tag else tag
-
-    def get_text(el, path: str) -> str:
-        x = el.find(path)
-        return (x.text or "").strip() if x is not None and x.text else ""
-
-    def find_first_attr(el, path: str, attr: str) -> str:
-        x = el.find(path)
-        return (x.attrib.get(attr) or "").strip() if x is not None else ""
-
-    def to_iso(dt_str: str) -> str | None:
-        if not dt_str:
-            return None
-        t = dt_str.strip()
-        # ISO-8601
-        try:
-            return datetime.fromisoformat(t.replace("Z", "+00:00")).isoformat()
-        except Exception:
-            pass
-        # RFC822 (RSS pubDate)
-        try:
-            return parsedate_to_datetime(t).isoformat()
-        except Exception:
-            return None
+def _release(el) -> None:
+    # free already-consumed elements while streaming
+    el.clear()
+    if _HAS_LXML:
+        while el.getprevious() is not None:
+            del el.getparent()[0]
+
+
+def _root_tag(xml_bytes: bytes) -> str:
+    # only parse up to the first start tag
+    for _, el in ET.iterparse(io.BytesIO(xml_bytes), events=("start",)):
+        return _localname(el.tag)
+    return ""
+
+
+def _child_texts(el, fields: dict) -> dict[str, str]:
+    # one pass over the direct children; first occurrence of each tag wins
+    out: dict[str, str] = {}
+    for c in el:
+        k = fields.get(c.tag)
+        if k is not None and k not in out:
+            out[k] = (c.text or "").strip()
+    return out
+
+
+@lru_cache(maxsize=4096)
+def _to_iso(dt_str: str) -> str | None:
+    if not dt_str:
+        return None
+    t = dt_str.strip()
+    dt = _fast_iso_z(t)
+    if dt is not None:
+        return dt.isoformat()
+    # ISO-8601
+    try:
+        return datetime.fromisoformat(t.replace("Z", "+00:00")).isoformat()
+    except Exception:
+        pass
+    # RFC822 (RSS pubDate)
+    try:
+        return parsedate_to_datetime(t).isoformat()
+    except Exception:
+        return None
+
+
+def _first_href(el) -> str:
+    for lk in el.findall(f"./{ATOM_LINK}"):
+        href = (lk.attrib.get("href") or "").strip()
+        if href:
+            return href
+    return ""
+
+
+def _rss_item(it, strict: bool = False) -> FeedItem | None:
+    f = _child_texts(it, _RSS_FIELDS)
+    url = f.get("link", "")
+    if strict and not (f.get("title") and url):
+        return None
+    title = f.get("title") or "(no title)"
+    # pubDate or dc:date
+    pub = f.get("pub") or f.get("date", "")
+    return FeedItem(title=title, url=url, published_at=_to_iso(pub))
+
+
+def _atom_entry(e, feed_link: str, strict: bool = False) -> FeedItem | None:
+    f: dict[str, str] = {}
+    url = ""
+    for c in e:
+        t = c.tag
+        if t == ATOM_LINK:
+            # first link with a non-empty href
+            if not url:
+                url = (c.attrib.get("href") or "").strip()
+            continue
+        k = _ATOM_FIELDS.get(t)
+        if k is not None and k not in f:
+            f[k] = (c.text or "").strip()
+    if strict and not (f.get("title") and url):
+        return None
+    title = f.get("title") or "(no title)"
+    # entry link (may be missing) -> feed-level link
+    url = url or feed_link
+    return FeedItem(title=title, url=url, published_at=_to_iso(f.get("published") or f.get("updated", "")))
+
+
+def iterparse_rss_or_atom(xml_bytes: bytes, *, strict: bool = False, recover: bool = False) -> Iterator[FeedItem]:
+    """
+    Streaming variant of parse_rss_or_atom for large bodies.
+    Items are yielded as their closing tag is seen and then released, so the
+    full DOM is never held. Atom entries without a link need the feed-level
+    link, which may come later; from such an entry on, items are buffered
+    (keeping document order) until that link is seen.
+    recover=True: with lxml, keep going past malformed markup / undefined
+    entities (&nbsp;); the stdlib parser has no recovery and still raises.
+    """
+    feed_link = ""
+    buffered: list[FeedItem] = []
+    depth = 0
+    kw = {"recover": True} if (recover and _HAS_LXML) else {}
+    for event, el in ET.iterparse(io.BytesIO(xml_bytes), events=("start", "end"), **kw):
+        if event == "start":
+            depth += 1
+            continue
+        depth -= 1
+        tag = el.tag
+        if tag in _RSS_ITEM_TAGS:
+            item = _rss_item(el, strict)
+            _release(el)
+            if item is not None:
+                yield item
+        elif tag == ATOM_ENTRY:
+            item = _atom_entry(el, feed_link, strict)
+            _release(el)
+            if item is None:
+                continue
+            if buffered or not item.url:
+                buffered.append(item)
+            else:
+                yield item
+        elif tag == ATOM_LINK and depth == 1 and not feed_link:
+            feed_link = (el.attrib.get("href") or "").strip()
+            if feed_link:
+                for item in buffered:
+                    item.url = item.url or feed_link
+                    yield item
+                buffered.clear()
+    yield from buffered
+
+
+def parse_rss_or_atom(xml_bytes: bytes, *, strict: bool = False) -> list[FeedItem]:
+    """
+    RSS 2.0 / Atom -> FeedItem list.
+    - default: lenient ("(no title)" placeholder, Atom entries fall back to the feed link)
+    - strict=True: keep only items that carry their own title and link
+    """
+    if len(xml_bytes) > STREAM_THRESHOLD:
+        return list(iterparse_rss_or_atom(xml_bytes, strict=strict))
 
     root = ET.fromstring(xml_bytes)
-    tag = strip_ns(root.tag).lower()
+    tag = _localname(root.tag)
 
     out: list[FeedItem] = []
 
@@ -97,82 +269,60 @@ def parse_rss_or_atom(xml_bytes: bytes) -> list[FeedItem]:
         if ch is None:
             return out
         for it in ch.findall("./item"):
-            title = get_text(it, "./title") or "(no title)"
-            url = get_text(it, "./link")
-            # pubDate or dc:date
-            pub = get_text(it, "./pubDate") or get_text(it, "./{http://purl.org/dc/elements/1.1/}date")
-            out.append(FeedItem(title=title, url=url, published_at=to_iso(pub)))
+            item = _rss_item(it, strict)
+            if item is not None:
+                out.append(item)
         return out
 
     # ---------- Atom ----------
     if tag == "feed":
         # feed-level link fallback (when <entry> has no link)
-        feed_link = ""
-        for lk in root.findall("./{http://www.w3.org/2005/Atom}link"):
-            href = (lk.attrib.get("href") or "").strip()
-            if href:
-                feed_link = href
-                break
-
-        for e in root.findall("./{http://www.w3.org/2005/Atom}entry"):
-            title = get_text(e, "./{http://www.w3.org/2005/Atom}title") or "(no title)"
-
-            # entry link (may be missing)
-            url = ""
-            for lk in e.findall("./{http://www.w3.org/2005/Atom}link"):
-                href = (lk.attrib.get("href") or "").strip()
-                if href:
-                    url = href
-                    break
-            if not url:
-                url = feed_link
-
-            updated = get_text(e, "./{http://www.w3.org/2005/Atom}updated")
-            published = get_text(e, "./{http://www.w3.org/2005/Atom}published")
-            out.append(FeedItem(title=title, url=url, published_at=to_iso(published or updated)))
+        feed_link = _first_href(root)
+        for e in root.findall(f"./{ATOM_ENTRY}"):
+            item = _atom_entry(e, feed_link, strict)
+            if item is not None:
+                out.append(item)
         return out
 
     # ---------- Fallback: try Atom then RSS ----------
     # Some feeds may have unexpected root tags; attempt best-effort parsing.
     try:
         # Atom-like: look for entry elements
-        entries = root.findall(".//{http://www.w3.org/2005/Atom}entry")
+        entries = root.findall(f".//{ATOM_ENTRY}")
         if entries:
             feed_link = ""
-            lk0 = root.find(".//{http://www.w3.org/2005/Atom}link")
+            lk0 = root.find(f".//{ATOM_LINK}")
             if lk0 is not None:
                 feed_link = (lk0.attrib.get("href") or "").strip()
 
             for e in entries:
-                title = get_text(e, "./{http://www.w3.org/2005/Atom}title") or "(no title)"
-                url = ""
-                for lk in e.findall("./{http://www.w3.org/2005/Atom}link"):
-                    href = (lk.attrib.get("href") or "").strip()
-                    if href:
-                        url = href
-                        break
-                if not url:
-                    url = feed_link
-                updated = get_text(e, "./{http://www.w3.org/2005/Atom}updated")
-                published = get_text(e, "./{http://www.w3.org/2005/Atom}published")
-                out.append(FeedItem(title=title, url=url, published_at=to_iso(published or updated)))
+                item = _atom_entry(e, feed_link, strict)
+                if item is not None:
+                    out.append(item)
             return out
     except Exception:
         pass
 
     try:
-        # RSS-like: look for item elements
-        for it in root.findall(".//item"):
-            title = get_text(it, "./title") or "(no title)"
-            url = get_text(it, "./link")
-            pub = get_text(it, "./pubDate") or get_text(it, "./{http://purl.org/dc/elements/1.1/}date")
-            out.append(FeedItem(title=title, url=url, published_at=to_iso(pub)))
+        # RSS-like: look for item elements (RSS 1.0 / RDF items are namespaced)
+        for it in root.findall(".//item") or root.findall(f".//{RSS1_ITEM}"):
+            item = _rss_item(it, strict)
+            if item is not None:
+                out.append(item)
     except Exception:
         pass
 
     return out
 
 
+def parse_feed(xml_bytes: bytes) -> list[FeedItem]:
+    """
+    Strict RSS/Atom parse (formerly core.rss_parser.parse_feed):
+    only items that have both a title and their own link.
+    """
+    return parse_rss_or_atom(xml_bytes, strict=True)
+
+
 def parse_opml(xml_bytes: bytes) -> list[str]:
     root = ET.fromstring(xml_bytes)
     urls: list[str] = []
@@ -185,26 +335,26 @@ def parse_opml(xml_bytes: bytes) -> list[str]:
 
 def parse_cap_alert(xml_bytes: bytes) -> list[FeedItem]:
     root = ET.fromstring(xml_bytes)
-    if _strip_ns(root.tag).lower() != "alert":
+    if _localname(root.tag) != "alert":
         return []
 
     # sent might be nested, so iterate
     sent = None
     for el in root.iter():
-        if _strip_ns(el.tag).lower() == "sent":
+        if _localname(el.tag) == "sent":
             sent = _parse_time(_txt(el))
             break
 
     out: list[FeedItem] = []
     for info in root.iter():
-        if _strip_ns(info.tag).lower() != "info":
+        if _localname(info.tag) != "info":
             continue
 
         headline = ""
         event = ""
         web = ""
         for c in list(info):
-            n = _strip_ns(c.tag).lower()
+            n = _localname(c.tag)
             if n == "headline":
                 headline = _txt(c)
             elif n == "event":
@@ -219,8 +369,7 @@ def parse_cap_alert(xml_bytes: bytes) -> list[FeedItem]:
 
 
 def parse_any_feed(xml_bytes: bytes) -> list[FeedItem]:
-    root = ET.fromstring(xml_bytes)
-    tag = _strip_ns(root.tag).lower()
+    tag = _root_tag(xml_bytes)
     if tag == "alert":
         return parse_cap_alert(xml_bytes)
     return parse_rss_or_atom(xml_bytes)
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+# directories already created by this process (raw dumps reuse the same few per run)
+_made_dirs: set[str] = set()
+
+
+def ensure_dir(path: Path) -> None:
+    key = str(path)
+    if key in _made_dirs:
+        return
+    path.mkdir(parents=True, exist_ok=True)
+    _made_dirs.add(key)
+
+
+def write_raw(path: Path, data: bytes) -> None:
+    """
+    Raw dump: parent dir created once per process, then open / write / close on the fd
+    (no Python file object or buffer copy). Safe to call from worker threads.
+    """
+    ensure_dir(path.parent)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
@@ -1,14 +1,43 @@
 from __future__ import annotations
 
 import os
-import hashlib
-import json
+import http.client
+import sqlite3
+import threading
 import time
-import urllib.error
-import urllib.request
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
+from urllib.parse import SplitResult, urljoin, urlsplit
+
+_REDIRECT_CODES = {301, 302, 303, 307, 308}
+MAX_REDIRECTS = 5
+
+
+CACHE_DB_NAME = "cache.sqlite"
+
+CACHE_SCHEMA_SQL = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+
+CREATE TABLE IF NOT EXISTS http_cache (
+  url TEXT PRIMARY KEY,
+  etag TEXT,
+  last_modified TEXT,
+  fetched_at REAL,
+  body BLOB
+);
+
+-- data derived from the cached body (e.g. parsed feed items), one row per (url, kind);
+-- dropped whenever a new body is stored, so a row always matches http_cache.body
+CREATE TABLE IF NOT EXISTS http_parsed (
+  url TEXT NOT NULL,
+  kind TEXT NOT NULL,
+  data BLOB,
+  PRIMARY KEY (url, kind)
+);
+""".strip()
 
 
 @dataclass
@@ -23,10 +52,17 @@ class HttpResponse:
 class PoliteHttpClient:
     """
     Stdlib-only HTTP client with:
-    - global rate limiting
+    - per-host rate limiting (different hosts do not wait on each other)
     - exponential backoff retry
-    - ETag / Last-Modified conditional GET cache
-    - correct handling for HTTP 304 (urllib raises it as HTTPError)
+    - ETag / Last-Modified conditional GET cache (HTTP 304 -> cached body),
+      stored as one row per URL in <cache_dir>/cache.sqlite
+    - load_parsed()/save_parsed(): per-URL data derived from the cached body
+      (invalidated when a new body arrives), so callers can skip re-parsing on 304
+    - keep-alive: one persistent http.client connection per (scheme, host),
+      per thread, so repeated polls of the same host skip TCP/TLS handshakes
+    - close() / with PoliteHttpClient(...) as client: releases all sockets + the cache db
+    - redirects followed (up to MAX_REDIRECTS)
+    - thread-safe: concurrent fan-out goes through core.concurrency.run_per_host
     """
     def __init__(
         self,
@@ -42,39 +78,158 @@ class PoliteHttpClient:
         self.timeout_seconds = timeout_seconds
         self.max_retries = max_retries
         self.user_agent = user_agent
-        self._last_ts = 0.0
+        # netloc -> earliest time.monotonic() at which the next request may start
+        self._next_ok: dict[str, float] = {}
+        self._gate_lock = threading.Lock()
+        # url -> meta (etag / last_modified / fetched_at); write-through to http_cache
+        self._meta_cache: dict[str, dict] = {}
+        self._db = sqlite3.connect(str(self.cache_dir / CACHE_DB_NAME), check_same_thread=False)
+        self._db.executescript(CACHE_SCHEMA_SQL)
+        self._db_lock = threading.Lock()
+        # per-thread {(scheme, netloc): connection}; http.client connections are not thread-safe
+        self._local = threading.local()
+        # every live connection (all threads), so close() can reach worker-thread sockets too
+        self._all_conns: set[http.client.HTTPConnection] = set()
+        self._conns_lock = threading.Lock()
+        self._closed = False
+
+    # ---------- connections ----------
+    def _conns(self) -> dict[tuple[str, str], http.client.HTTPConnection]:
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+        return conns
 
-    def _sleep_gate(self) -> None:
-        now = time.time()
-        wait = self.min_interval - (now - self._last_ts)
-        if wait > 0:
-            time.sleep(wait)
-        self._last_ts = time.time()
+    def _connection(self, key: tuple[str, str]) -> http.client.HTTPConnection:
+        conns = self._conns()
+        conn = conns.get(key)
+        if conn is None:
+            scheme, netloc = key
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = conns[key] = cls(netloc, timeout=self.timeout_seconds)
+            with self._conns_lock:
+                self._all_conns.add(conn)
+        return conn
 
-    def _key(self, url: str) -> str:
-        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+    def _drop_connection(self, key: tuple[str, str]) -> None:
+        conn = self._conns().pop(key, None)
+        if conn is not None:
+            with self._conns_lock:
+                self._all_conns.discard(conn)
+            conn.close()
 
-    def _meta_path(self, url: str) -> Path:
-        return self.cache_dir / f"{self._key(url)}.meta.json"
+    def close(self) -> None:
+        """
+        Close every keep-alive connection (opened by any thread) and the cache db.
+        Call after all worker threads are done; safe to call twice.
+        """
+        with self._conns_lock:
+            conns, self._all_conns = self._all_conns, set()
+        for conn in conns:
+            conn.close()
+        self._conns().clear()
+        with self._db_lock:
+            if not self._closed:
+                self._closed = True
+                self._db.close()
 
-    def _body_path(self, url: str) -> Path:
-        return self.cache_dir / f"{self._key(url)}.body.bin"
+    def __enter__(self) -> PoliteHttpClient:
+        return self
 
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _roundtrip(self, method: str, parts: SplitResult, headers: dict[str, str]) -> tuple[int, dict[str, str], bytes]:
+        key = (parts.scheme, parts.netloc)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        for attempt in (1, 2):
+            conn = self._connection(key)
+            try:
+                conn.request(method, path, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # idle keep-alive connection was closed by the server: reconnect once
+                self._drop_connection(key)
+                if attempt == 2:
+                    raise
+                continue
+            except Exception:
+                self._drop_connection(key)
+                raise
+            if resp.will_close:
+                self._drop_connection(key)
+            return resp.status, {k.lower(): v for k, v in resp.getheaders()}, body
+        raise RuntimeError(f"unreachable: {method} {parts.geturl()}")
+
+    def _send(self, method: str, url: str, headers: dict[str, str]) -> tuple[int, dict[str, str], bytes]:
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            if parts.scheme not in ("http", "https"):
+                raise ValueError(f"Unsupported URL scheme: {url}")
+            status, resp_headers, body = self._roundtrip(method, parts, headers)
+            location = resp_headers.get("location")
+            if status in _REDIRECT_CODES and location:
+                url = urljoin(url, location)
+                continue
+            return status, resp_headers, body
+        raise RuntimeError(f"Too many redirects: {url}")
+
+    def _sleep_gate(self, host: str = "") -> None:
+        # reserve the next slot for this host under the lock, sleep outside it.
+        # monotonic: immune to wall-clock (NTP) jumps; one clock read per call
+        with self._gate_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_ok.get(host, 0.0))
+            self._next_ok[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    # ---------- cache ----------
+    # _db and _meta_cache are shared by the run_per_host worker threads: every use holds _db_lock
     def _load_meta(self, url: str) -> dict:
-        p = self._meta_path(url)
-        if not p.exists():
-            return {}
-        try:
-            return json.loads(p.read_text(encoding="utf-8"))
-        except Exception:
-            return {}
+        with self._db_lock:
+            cached = self._meta_cache.get(url)
+            if cached is not None:
+                return cached
+            row = self._db.execute(
+                "SELECT etag, last_modified, fetched_at FROM http_cache WHERE url=?",
+                (url,),
+            ).fetchone()
+            meta = {} if row is None else {"etag": row[0], "last_modified": row[1], "fetched_at": row[2]}
+            self._meta_cache[url] = meta
+            return meta
 
-    def _save_meta(self, url: str, meta: dict) -> None:
-        self._meta_path(url).write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+    def _save(self, url: str, meta: dict, body: bytes) -> None:
+        with self._db_lock, self._db:
+            self._meta_cache[url] = meta
+            self._db.execute(
+                "INSERT OR REPLACE INTO http_cache(url, etag, last_modified, fetched_at, body) VALUES(?,?,?,?,?)",
+                (url, meta.get("etag"), meta.get("last_modified"), meta.get("fetched_at"), body),
+            )
+            # new body: anything parsed from the old one is stale
+            self._db.execute("DELETE FROM http_parsed WHERE url=?", (url,))
 
     def _load_cached_body(self, url: str) -> bytes:
-        p = self._body_path(url)
-        return p.read_bytes() if p.exists() else b""
+        with self._db_lock:
+            row = self._db.execute("SELECT body FROM http_cache WHERE url=?", (url,)).fetchone()
+        return bytes(row[0]) if row is not None and row[0] is not None else b""
+
+    def load_parsed(self, url: str, kind: str) -> bytes | None:
+        """Derived data stored by save_parsed for the currently cached body of url (None if absent)."""
+        with self._db_lock:
+            row = self._db.execute("SELECT data FROM http_parsed WHERE url=? AND kind=?", (url, kind)).fetchone()
+        return bytes(row[0]) if row is not None and row[0] is not None else None
+
+    def save_parsed(self, url: str, kind: str, data: bytes) -> None:
+        # only meaningful while the body it came from is cached; a new body clears it (_save)
+        with self._db_lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO http_parsed(url, kind, data) VALUES(?,?,?)",
+                (url, kind, data),
+            )
 
     def get(self, url: str) -> HttpResponse:
 
@@ -102,34 +257,27 @@ class PoliteHttpClient:
 
         for attempt in range(1, self.max_retries + 1):
             try:
-                self._sleep_gate()
-                req = urllib.request.Request(url, headers=headers, method="GET")
-                with urllib.request.urlopen(req, timeout=self.timeout_seconds) as resp:
-                    status = getattr(resp, "status", 200)
-                    resp_headers = {k.lower(): v for k, v in resp.headers.items()}
-                    body = resp.read()
+                self._sleep_gate(urlsplit(url).netloc)
+                status, resp_headers, body = self._send("GET", url, headers)
+            except Exception as e:
+                last_error = e
+                time.sleep(min(8, 2 ** (attempt - 1)))
+                continue
+
+            if status == 304:
+                cached = self._load_cached_body(url)
+                return HttpResponse(url=url, status=304, headers=resp_headers, body=cached, from_cache=True)
 
+            if 200 <= status < 300:
                 # Normal 2xx path
-                self._save_meta(url, {
+                self._save(url, {
                     "etag": resp_headers.get("etag"),
                     "last_modified": resp_headers.get("last-modified"),
                     "fetched_at": time.time(),
-                })
-                self._body_path(url).write_bytes(body)
+                }, body)
                 return HttpResponse(url=url, status=status, headers=resp_headers, body=body, from_cache=False)
 
-            except urllib.error.HTTPError as e:
-                # IMPORTANT: urllib raises 304 as HTTPError
-                if e.code == 304:
-                    cached = self._load_cached_body(url)
-                    hdrs = {k.lower(): v for k, v in (e.headers.items() if e.headers else [])}
-                    return HttpResponse(url=url, status=304, headers=hdrs, body=cached, from_cache=True)
-
-                last_error = e
-                time.sleep(min(8, 2 ** (attempt - 1)))
-
-            except Exception as e:
-                last_error = e
-                time.sleep(min(8, 2 ** (attempt - 1)))
+            last_error = RuntimeError(f"HTTP {status}: {url}")
+            time.sleep(min(8, 2 ** (attempt - 1)))
 
         raise RuntimeError(f"HTTP GET failed after {self.max_retries} retries: {url}") from last_error
@@ -73,7 +73,7 @@ def main() -> int:
         sections = [
             {"h2": "Run Date", "body": args.date},
             {"h2": "Config", "body": args.config},
-            {"h2": "Summary", "body": f"sources={result.get('sources')} total={result.get('total')} inserted={result.get('inserted')}"},
+            {"h2": "Summary", "body": f"sources={result.get('sources')} total={result.get('total')} inserted={result.get('inserted')} fetch_errors={result.get('fetch_errors')}"},
         ]
         out = write_markdown_report(
             Path("reports/news"),
@@ -81,7 +81,7 @@ def main() -> int:
             f"News Ingest - {args.date}",
             sections,
         )
-        print(f"[NEWS] sources={result.get('sources')} total={result.get('total')} inserted={result.get('inserted')}", flush=True)
+        print(f"[NEWS] sources={result.get('sources')} total={result.get('total')} inserted={result.get('inserted')} fetch_errors={result.get('fetch_errors')}", flush=True)
         print(f"[OK] {out}")
         return 0
 
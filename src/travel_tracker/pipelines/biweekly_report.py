@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections import defaultdict
 from datetime import datetime, timedelta
 from travel_tracker.storage.repository import Repository
 from travel_tracker.reporting import md
@@ -17,15 +18,51 @@ TOPICS = [
 TOP_N_PER_TOPIC = 5
 SUMMARY_TOP_N_CITIES = 10
 
+# both take (start, run_date + 1 day, limit): a half-open range on the raw timestamp (index-friendly)
+
+# Summary: top cities by total news count in window
+_SUMMARY_SQL = """
+SELECT city, COUNT(*) AS n
+FROM news_items
+WHERE COALESCE(published_at, fetched_at) >= ?
+  AND COALESCE(published_at, fetched_at) < ?
+GROUP BY city
+ORDER BY n DESC, city ASC
+LIMIT ?
+"""
+
+# Top N per (city, topic) in one windowed query instead of one list_news() per pair
+_NEWS_SQL = """
+SELECT city, topic, source, title, url, published_at, fetched_at
+FROM (
+  SELECT city, topic, source, title, url, published_at, fetched_at,
+         ROW_NUMBER() OVER (
+           PARTITION BY city, topic
+           ORDER BY COALESCE(published_at, fetched_at) DESC
+         ) AS rn
+  FROM news_items
+  WHERE COALESCE(published_at, fetched_at) >= ?
+    AND COALESCE(published_at, fetched_at) < ?
+)
+WHERE rn <= ?
+ORDER BY city, topic, rn
+"""
+
 
 def run_biweekly(run_date: str) -> dict:
     run_dt = datetime.strptime(run_date, "%Y-%m-%d")
     start_dt = run_dt - timedelta(days=13)  # 含今天共 14 天
     print(f"[BIWEEKLY] start run_date={run_date}", flush=True)
 
-    repo = Repository()
+    # schema/indexes via the writer (no-op once present), then read through a read-only connection
+    writer = Repository()
+    try:
+        writer.init_schema()
+    finally:
+        writer.close()
+
+    repo = Repository(mode="ro")
     try:
-        repo.init_schema()
 
         sections = [
             {"h2": "Window", "body": f"{start_dt:%Y-%m-%d} ~ {run_date} (14 days, inclusive)"},
@@ -39,53 +76,51 @@ def run_biweekly(run_date: str) -> dict:
         body.append(md.p(f"期間：{start_dt:%Y-%m-%d} ~ {run_date}（含今天，共 14 天）"))
         body.append(md.p(f"每城市每類最多顯示 Top {TOP_N_PER_TOPIC} 則（避免報表過長）。"))
 
-        # Summary: top cities by total news count in window
-        # Use direct SQL on repo.conn (SQLite) for efficiency
-        sql = """
-        SELECT city, COUNT(*) AS n
-        FROM news_items
-        WHERE SUBSTR(COALESCE(published_at, fetched_at), 1, 10) >= ?
-          AND SUBSTR(COALESCE(published_at, fetched_at), 1, 10) <= ?
-        GROUP BY city
-        ORDER BY n DESC, city ASC
-        LIMIT ?
-        """
-        rows = repo.conn.execute(sql, (start_dt.strftime("%Y-%m-%d"), run_date, SUMMARY_TOP_N_CITIES)).fetchall()
+        start_ymd = start_dt.strftime("%Y-%m-%d")
+        end_excl = (run_dt + timedelta(days=1)).strftime("%Y-%m-%d")
+
+        # Use direct SQL on repo.conn (SQLite) for efficiency; both reads in one
+        # transaction -> same snapshot, no per-statement autocommit
+        with repo.conn:
+            repo.conn.execute("BEGIN")
+            rows = repo.conn.execute(_SUMMARY_SQL, (start_ymd, end_excl, SUMMARY_TOP_N_CITIES)).fetchall()
+            top_rows = repo.conn.execute(_NEWS_SQL, (start_ymd, end_excl, TOP_N_PER_TOPIC)).fetchall()
+
         if rows:
             body.append(md.h3("城市新聞量排行（Top）"))
             body.append(md.table(["City", "Items (14d)"], [[r[0], r[1]] for r in rows]))
         else:
             body.append(md.p("_No news data yet. Run `... main news` after setting RSS sources._"))
 
+        top: dict[tuple[str, str], list[dict]] = defaultdict(list)
+        for r in top_rows:
+            top[(r[0], r[1])].append({
+                "source": r[2],
+                "title": r[3],
+                "url": r[4],
+                "published_at": r[5],
+                "fetched_at": r[6],
+            })
+
         any_city = False
 
+        # fragments go straight into body (one join at the end)
         for city in CITIES:
-            city_blocks = []
             city_any = False
 
             for topic_key, topic_name in TOPICS:
-                items = repo.list_news(
-                    start_date=start_dt.strftime("%Y-%m-%d"),
-                    end_date=run_date,
-                    city=city,
-                    topic=topic_key,
-                    limit=TOP_N_PER_TOPIC,
-                )
+                items = top.get((city, topic_key))
 
                 if items:
-                    city_any = True
-                    if not city_blocks:
-                        city_blocks.append(md.h3(city))
-                    city_blocks.append(md.p(f"**{topic_name}（Top {TOP_N_PER_TOPIC}）**"))
+                    if not city_any:
+                        body.append(md.h3(city))
+                        city_any = any_city = True
+                    body.append(md.p(f"**{topic_name}（Top {TOP_N_PER_TOPIC}）**"))
                     rows2 = []
                     for it in items:
                         dt = (it.get("published_at") or it.get("fetched_at") or "")[:19]
                         rows2.append([dt, it.get("source", ""), it.get("title", ""), it.get("url", "")])
-                    city_blocks.append(md.table(["Date", "Source", "Title", "URL"], rows2))
-
-            if city_any:
-                any_city = True
-                body.append("".join(city_blocks))
+                    body.append(md.table(["Date", "Source", "Title", "URL"], rows2))
 
         if not any_city:
             body.append(md.p("_No per-city news found in this window._"))
@@ -1,11 +1,34 @@
 from __future__ import annotations
 
 from datetime import date as _date
+from itertools import islice
+from urllib.parse import urlsplit
+
+from travel_tracker.core.concurrency import run_per_host
+from travel_tracker.core.http_client import PoliteHttpClient
 from travel_tracker.sources_loader import load_sources
 from travel_tracker.storage.repository import Repository
 from travel_tracker.sources.news_rss import NewsSource, fetch_rss_items
 
 
+def _fetch_all(sources_list: list[tuple[str, NewsSource]], max_per_source: int) -> list[list[dict] | Exception]:
+    # 各來源並行抓取（同一 host 一次一個），回傳順序與 sources_list 相同
+    # a failing source comes back as its exception (counted by the caller), the others still run
+    # one client for the run, closed here (sockets opened by the worker threads + cache db)
+    with PoliteHttpClient(cache_dir="data/cache/http", rps=0.2, timeout_seconds=8, max_retries=1) as client:
+        def _one(src: NewsSource) -> list[dict] | Exception:
+            try:
+                return list(islice(fetch_rss_items(src, client), max_per_source))
+            except Exception as e:
+                return e
+
+        return run_per_host(
+            [src for _, src in sources_list],
+            lambda src: urlsplit(src.rss_url).netloc,
+            _one,
+        )
+
+
 def run_daily_news(
     run_date: str | None = None,
     city_code: str = "SIN",
@@ -53,40 +76,37 @@ def run_daily_news(
     inserted = 0
     total_seen = 0
     sources_ok = 0
+    fetch_errors: list[str] = []
 
     try:
         repo.init_schema()
 
-        for source_id, src in sources_list:
-            c = 0
-            any_ok = False
-            for item in fetch_rss_items(src):
-                total_seen += 1
-
-                # 強制補齊 signals_news 需要的欄位（以你實際表結構為準）
-                item.setdefault("run_date", d)
-                item.setdefault("city_code", city_code)
-                item.setdefault("city_name_zh", city_name_zh)
-                item.setdefault("source", source_id)
-                item.setdefault("source_id", source_id)
-
-                # 重要：寫入 signals_news（不要再寫 news_items）
-                if repo.insert_signal("signals_news", item):
-                    inserted += 1
-                any_ok = True
-
-                c += 1
-                if c >= max_per_source:
-                    break
-
-            if any_ok:
+        # 網路 I/O 先並行做完；寫 DB 留在主執行緒
+        fetched = _fetch_all(sources_list, max_per_source)
+
+        rows = []
+        for (source_id, _), items in zip(sources_list, fetched):
+            if isinstance(items, Exception):
+                fetch_errors.append(f"{source_id}: {type(items).__name__}: {items}")
+                continue
+            total_seen += len(items)
+            if items:
                 sources_ok += 1
+            rows.extend(
+                (d, city_code, city_name_zh, source_id, it["title"], it["url"], it["published_at"])
+                for it in items
+            )
+
+        # 重要：寫入 signals_news（不要再寫 news_items）；一次 executemany + 一次 commit
+        inserted = repo.insert_signals_many("signals_news", rows)
 
         return {
             "run_date": d,
             "city_code": city_code,
             "sources_total": len(sources_list),
             "sources_ok": sources_ok,
+            "fetch_errors": len(fetch_errors),
+            "errors": fetch_errors,
             "total_seen": total_seen,
             "inserted": inserted,
             "max_per_source": max_per_source,
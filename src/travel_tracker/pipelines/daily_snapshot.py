@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 import hashlib
+import re
+import sqlite3
 from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 import os
 from typing import Any
+from urllib.parse import urlsplit
 
+from travel_tracker.core.concurrency import run_per_host
 from travel_tracker.core.http_client import PoliteHttpClient
 from travel_tracker.sources.news.collector import fetch_items
 from travel_tracker.sources_loader import load_sources
@@ -18,107 +23,103 @@ TOP_WEATHER = 3
 TOP_SAFETY = 5
 
 
-def _dt_key(published_at: str | None, created_at: str | None) -> datetime:
-    for s in (published_at, created_at):
-        if not s:
-            continue
-        try:
-            return datetime.fromisoformat(s.replace("Z", "+00:00"))
-        except Exception:
-            pass
-    return datetime.min
-
-
 def _md_escape(s: str) -> str:
     # minimal escape for markdown links
     return (s or "").replace("]", "\\]")
 
 
 
+def _kw_pattern(kws) -> re.Pattern | None:
+    # one alternation scan instead of any(k in s for k in kws); None if no usable keyword
+    kws = [k for k in kws if k]
+    return re.compile("|".join(map(re.escape, kws))) if kws else None
+
+
+
 # --- TW city-level filter (report only) ---
-TW_CITY_KEYWORDS = {
-    "TPE": ["臺北", "台北", "新北", "基隆"],
-    "KHH": ["高雄"],
-    "TNN": ["臺南", "台南"],
+TW_CITY_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "TPE": ("臺北", "台北", "新北", "基隆"),
+    "KHH": ("高雄",),
+    "TNN": ("臺南", "台南"),
 }
 
-def _filter_tw_weather(city_code: str, items: list[dict]) -> list[dict]:
-    kws = TW_CITY_KEYWORDS.get(city_code)
-    if not kws:
-        return items
+_TW_CITY_RE = {code: _kw_pattern(kws) for code, kws in TW_CITY_KEYWORDS.items()}
 
-    def hit(title: str) -> bool:
-        t = title or ""
-        return any(k in t for k in kws)
+def _filter_tw_weather(city_code: str, items: list[sqlite3.Row]) -> list[sqlite3.Row]:
+    pat = _TW_CITY_RE.get(city_code)
+    if pat is None:
+        return items
 
-    kept = [it for it in items if hit(it.get("title", ""))]
+    kept = [it for it in items if pat.search(it["title"] or "")]
     # 若全部被濾光，保留原本資料避免整段變空（你可以之後改成回傳 kept）
     return kept if kept else items
 
 
 
 # --- City-level filter for NEWS (report only): must match city keywords, otherwise skip ---
-CITY_NEWS_KEYWORDS = {
-    "KUL": ["kuala lumpur", "kl", "putrajaya", "selangor", "petaling jaya", "pj", "吉隆坡"],
-    "PEN": ["penang", "george town", "georgetown", "seberang perai", "butterworth", "檳城", "槟城"],
-
-    "SIN": ["singapore", "新加坡"],
-    "JKT": ["jakarta", "雅加达", "雅加達"],
-    "DPS": ["bali", "denpasar", "峇里島", "巴厘", "登巴薩"],
-    "HKT": ["phuket", "普吉"],
-    "CNX": ["chiang mai", "清邁"],
-    "BKK": ["bangkok", "曼谷"],
-
-    "PQC": ["phu quoc", "富國", "富国"],
-    "SGN": ["ho chi minh", "saigon", "胡志明", "西贡", "西貢"],
-
-    "MPH": ["boracay", "長灘", "长滩"],
-    "CEB": ["cebu", "宿霧", "宿雾"],
-    "PPS": ["palawan", "puerto princesa", "巴拉望", "巴拉望島", "公主港"],
-
-    "TPE": ["taipei", "臺北", "台北", "new taipei", "新北", "keelung", "基隆"],
-    "KHH": ["kaohsiung", "高雄"],
-    "TNN": ["tainan", "臺南", "台南"],
-
-    "CTS": ["hokkaido", "sapporo", "北海道", "札幌"],
-    "OSA": ["osaka", "大阪"],
-    "TYO": ["tokyo", "東京"],
-    "OKA": ["okinawa", "naha", "沖繩", "冲绳", "那覇", "那霸"],
+# keywords are matched case-insensitively: keep them lowercase here (normalized again below, once)
+CITY_NEWS_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "KUL": ("kuala lumpur", "kl", "putrajaya", "selangor", "petaling jaya", "pj", "吉隆坡"),
+    "PEN": ("penang", "george town", "georgetown", "seberang perai", "butterworth", "檳城", "槟城"),
+
+    "SIN": ("singapore", "新加坡"),
+    "JKT": ("jakarta", "雅加达", "雅加達"),
+    "DPS": ("bali", "denpasar", "峇里島", "巴厘", "登巴薩"),
+    "HKT": ("phuket", "普吉"),
+    "CNX": ("chiang mai", "清邁"),
+    "BKK": ("bangkok", "曼谷"),
+
+    "PQC": ("phu quoc", "富國", "富国"),
+    "SGN": ("ho chi minh", "saigon", "胡志明", "西贡", "西貢"),
+
+    "MPH": ("boracay", "長灘", "长滩"),
+    "CEB": ("cebu", "宿霧", "宿雾"),
+    "PPS": ("palawan", "puerto princesa", "巴拉望", "巴拉望島", "公主港"),
+
+    "TPE": ("taipei", "臺北", "台北", "new taipei", "新北", "keelung", "基隆"),
+    "KHH": ("kaohsiung", "高雄"),
+    "TNN": ("tainan", "臺南", "台南"),
+
+    "CTS": ("hokkaido", "sapporo", "北海道", "札幌"),
+    "OSA": ("osaka", "大阪"),
+    "TYO": ("tokyo", "東京"),
+    "OKA": ("okinawa", "naha", "沖繩", "冲绳", "那覇", "那霸"),
 }
 
-def _filter_city_news(city_code: str, items: list[dict]) -> list[dict]:
-    kws = CITY_NEWS_KEYWORDS.get(city_code)
-    if not kws:
+# lowercased + compiled once per city at import (matched against lowercased title/url)
+_CITY_NEWS_RE = {code: _kw_pattern(k.lower() for k in kws) for code, kws in CITY_NEWS_KEYWORDS.items()}
+
+# rows carry the city they were fetched *for* (sources are matched by country), not a city
+# detected in the item, so city_code cannot skip the scan. What repeats is the item itself:
+# every city of the same country gets the same (title, url) -> lowercase it once.
+@lru_cache(maxsize=8192)
+def _news_hay(title: str | None, url: str | None) -> str:
+    # "\n" never occurs in a keyword, so no match can span title and url
+    return f"{title or ''}\n{url or ''}".lower()
+
+
+def _filter_city_news(city_code: str, items: list[sqlite3.Row]) -> list[sqlite3.Row]:
+    pat = _CITY_NEWS_RE.get(city_code)
+    if pat is None:
         # 若你要「所有城市都必須符合城市條件」：把這行改成 `return []`
         return items
 
-    kws_l = [k.lower() for k in kws]
-
-    kept = []
-    for it in items:
-        title = (it.get("title") or "").lower()
-        url = (it.get("url") or "").lower()
-        if any(k in title for k in kws_l) or any(k in url for k in kws_l):
-            kept.append(it)
+    kept = [it for it in items if pat.search(_news_hay(it["title"], it["url"]))]
 
     # 不做 fallback：只符合國家但不符合城市 -> 直接跳過
     return kept
 
 
-def _fmt_items(items: list[dict], topn: int) -> str:
+def _fmt_items(items: list[sqlite3.Row], topn: int) -> str:
     if not items:
         return "- (none)"
+    # rows are already unique per (run_date, city, title, url): see Repository SIGNAL_DEDUP_KEY
     lines = []
-    seen = set()
     for it in items:
-        title = _md_escape(it.get("title", "") or "")
-        url = (it.get("url", "") or "").strip()
-        key = (title.strip().lower(), url.lower())
-        if key in seen:
-            continue
-        seen.add(key)
+        title = _md_escape(it["title"] or "")
+        url = (it["url"] or "").strip()
 
-        ts = (it.get("published_at") or "").strip()
+        ts = (it["published_at"] or "").strip()
         if url:
             lines.append(f"- [{title}]({url}){(' — ' + ts) if ts else ''}")
         else:
@@ -130,7 +131,7 @@ def _fmt_items(items: list[dict], topn: int) -> str:
     return "\n".join(lines) if lines else "- (none)"
 
 
-def _apply_limit_cities(destinations, limit_raw: str):
+def _apply_limit_cities(bundle, limit_raw: str):
     """
     TRAVEL_LIMIT_CITIES 支援：
     - 城市代碼：TPE,BKK
@@ -139,37 +140,10 @@ def _apply_limit_cities(destinations, limit_raw: str):
     """
     tokens = [t.strip() for t in (limit_raw or "").split(",") if t.strip()]
     if not tokens:
-        return destinations
-
-    by_id = {getattr(d, "id", "").upper(): d for d in destinations}
-    by_zh = {}
-    for d in destinations:
-        name = (getattr(d, "name_zh", "") or "").strip()
-        if name:
-            by_zh[name] = d
-            by_zh[name.replace("臺", "台")] = d
-
-    chosen = []
-    unknown = []
-    for t in tokens:
-        key = t.upper()
-        if key in by_id:
-            chosen.append(by_id[key]); continue
-        if t in by_zh:
-            chosen.append(by_zh[t]); continue
-        t2 = t.replace("臺", "台")
-        if t2 in by_zh:
-            chosen.append(by_zh[t2]); continue
-        unknown.append(t)
-
-    # de-dup keep order
-    seen = set()
-    uniq = []
-    for d in chosen:
-        cid = getattr(d, "id", None)
-        if cid and cid not in seen:
-            uniq.append(d)
-            seen.add(cid)
+        return bundle.destinations
+
+    # index is built once per loaded bundle (SourcesBundle.city_index)
+    uniq, unknown = bundle.city_index.resolve(tokens)
 
     print(f"[LIMIT] TRAVEL_LIMIT_CITIES={limit_raw} -> {[(getattr(d,'id',''), getattr(d,'name_zh','')) for d in uniq]}")
     if unknown:
@@ -177,6 +151,38 @@ def _apply_limit_cities(destinations, limit_raw: str):
     return uniq
 
 
+# report section -> signals table
+_REPORT_TABLES = (("news", "signals_news"), ("weather", "signals_weather"), ("safety", "signals_safety"))
+
+# sections cut to top N in SQL. news/weather are keyword-filtered in Python first
+# (_filter_city_news / _filter_tw_weather), so they are only ordered there, not cut.
+_SQL_TOP_N = {"safety": TOP_SAFETY}
+
+# (source column per table) -> UNION ALL SELECT for the report; built once per process
+_FETCH_SQL: dict[tuple[str | None, ...], str] = {}
+
+
+# ts_jd: sort key as a Julian day number (UTC), so "+08:00" and "Z" timestamps order by instant,
+# not as text. published_at carries its offset; created_at is naive local time ('utc' converts it).
+# Like the old Python sort: unparseable published_at falls back to created_at, neither -> NULL (last).
+def _report_select(kind: str, table: str, source_col: str | None) -> str:
+    cols = "kind, city_code, city_name_zh, source_id, title, url, published_at, created_at, ts, ts_jd"
+    base = (
+        f"SELECT '{kind}' AS kind, city_code, city_name_zh, {source_col or 'NULL'} AS source_id, "
+        f"title, url, published_at, created_at, COALESCE(published_at, created_at) AS ts, "
+        f"COALESCE(julianday(published_at), julianday(created_at, 'utc')) AS ts_jd "
+        f"FROM {table} WHERE run_date=:run_date"
+    )
+    top = _SQL_TOP_N.get(kind)
+    if top is None:
+        return base
+    return (
+        f"SELECT {cols} FROM ("
+        f"SELECT *, ROW_NUMBER() OVER (PARTITION BY city_code ORDER BY ts_jd DESC) AS rn FROM ({base})"
+        f") WHERE rn <= {top}"
+    )
+
+
 def run_daily(run_date: str, *, force: bool = False) -> dict[str, Any]:
     repo = Repository()
     repo.init_schema()
@@ -205,39 +211,13 @@ def run_daily(run_date: str, *, force: bool = False) -> dict[str, Any]:
     bundle = load_sources("data/sources.json")
 
 
-    # -----------------------------
-    # City keyword filtering (strict)
-    # -----------------------------
-    import os, json
-
-    require_city_match = os.getenv("TRAVEL_REQUIRE_CITY_MATCH", "1").strip() not in {"0","false","False"}
-    kw_path = os.getenv("TRAVEL_CITY_KEYWORDS", "data/city_keywords.json")
-    city_kw = {}
-    try:
-        kw_file = Path(kw_path)
-        if kw_file.exists():
-            city_kw = json.loads(kw_file.read_text(encoding="utf-8"))
-    except Exception:
-        city_kw = {}
-
-    def _match_city_kw(city_code: str, kind: str, title: str, url: str) -> bool:
-        """
-        kind: news/weather/safety
-        規則：
-          - strict(require_city_match=1) 時：該 city 若沒有 keywords -> 直接視為不匹配（跳過）
-          - 有 keywords -> title/url 任一包含關鍵字即匹配
-        """
-        city_code = (city_code or "").upper()
-        kw = (city_kw.get(city_code, {}) or {}).get(kind, []) or []
-        if require_city_match and not kw:
-            return False
-        hay = f"{title or ''}\n{url or ''}"
-        return any(k and k in hay for k in kw) if kw else True
     limit_raw = os.getenv("TRAVEL_LIMIT_CITIES", "").strip()
 
+    # load_sources() is cached: never mutate the bundle, keep the selection local
+    destinations = bundle.destinations
     if limit_raw:
 
-        bundle.destinations = _apply_limit_cities(bundle.destinations, limit_raw)
+        destinations = _apply_limit_cities(bundle, limit_raw)
 
 
     inserted = {"news": 0, "weather": 0, "safety": 0}
@@ -248,51 +228,67 @@ def run_daily(run_date: str, *, force: bool = False) -> dict[str, Any]:
     def _write_err(scope: str, city_id: str, source_id: str, url: str, exc: Exception) -> None:
         errors.append(f"- [{datetime.now().isoformat(timespec='seconds')}] [{scope}:{city_id}] {source_id} {url}\n  - {repr(exc)}")
 
+    # one source (OPML expanded into child feeds); runs in a worker thread,
+    # returns [(error_bucket, source_id, url, items | exception)]
+    def _fetch_source(kind: str, d: Any, s: Any) -> list[tuple[str, str, str, Any]]:
+        stype = (s.type or "").lower()
+        raw_dir = Path(f"data/raw/{run_date}/{kind}/{d.id}")
+        raw_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            if stype == "opml":
+                raw_path = raw_dir / f"{s.id}.opml"
+                _, urls = fetch_items(client=client, url=s.url, source_type="opml", raw_path=raw_path)
+                # expand OPML into child feeds
+                out = []
+                for u in urls:
+                    sid = f"{s.id}__{hashlib.md5(u.encode('utf-8')).hexdigest()[:8]}"
+                    child_raw = raw_dir / f"{sid}.xml"
+                    try:
+                        items, _ = fetch_items(client=client, url=u, source_type="rss", raw_path=child_raw)
+                        out.append(("opml", sid, u, items))
+                    except Exception as e:
+                        out.append(("opml", sid, u, e))
+                return out
+
+            raw_path = raw_dir / f"{s.id}.xml"
+            items, _ = fetch_items(client=client, url=s.url, source_type=stype, raw_path=raw_path)
+            return [(kind, s.id, s.url, items)]
+        except Exception as e:
+            return [(kind, s.id, s.url, e)]
+
     # generic runner for news/weather/safety
     def _run_kind(kind: str, sources: list[Any], table: str) -> None:
         nonlocal inserted
 
-        for d in bundle.destinations:
+        jobs = []
+        for d in destinations:
             # match by country code (ISO-2 in your current sources.json)
             matched = [s for s in sources if getattr(s, "country", None) == d.country and (getattr(s, "type", "") or "").lower() != "todo"]
-            for s in matched:
-                stype = (s.type or "").lower()
-                raw_dir = Path(f"data/raw/{run_date}/{kind}/{d.id}")
-                raw_dir.mkdir(parents=True, exist_ok=True)
-
-                try:
-                    if stype == "opml":
-                        raw_path = raw_dir / f"{s.id}.opml"
-                        _, urls = fetch_items(client=client, url=s.url, source_type="opml", raw_path=raw_path)
-                        # expand OPML into child feeds
-                        for u in urls:
-                            sid = f"{s.id}__{hashlib.md5(u.encode('utf-8')).hexdigest()[:8]}"
-                            child_raw = raw_dir / f"{sid}.xml"
-                            try:
-                                items, _ = fetch_items(client=client, url=u, source_type="rss", raw_path=child_raw)
-                                for it in items:
-                                    repo.insert_signal(table, run_date, d.id, d.name_zh, sid, it.title, it.url, it.published_at)
-                                    inserted[kind] += 1
-                                repo.commit()
-                            except Exception as e:
-                                fetch_errors["opml"] += 1
-                                _write_err(kind, d.id, sid, u, e)
-                        continue
-
-                    raw_path = raw_dir / f"{s.id}.xml"
-                    items, _ = fetch_items(client=client, url=s.url, source_type=stype, raw_path=raw_path)
-                    for it in items:
-                        repo.insert_signal(table, run_date, d.id, d.name_zh, s.id, it.title, it.url, it.published_at)
-                        inserted[kind] += 1
-                    repo.commit()
-
-                except Exception as e:
-                    fetch_errors[kind] += 1
-                    _write_err(kind, d.id, s.id, s.url, e)
-
-    _run_kind("news", bundle.news, "signals_news")
-    _run_kind("weather", bundle.weather, "signals_weather")
-    _run_kind("safety", bundle.safety, "signals_safety")
+            jobs.extend((d, s) for s in matched)
+
+        # fetch all sources concurrently (one in flight per host, see PoliteHttpClient rate limit),
+        # then insert on this thread: the sqlite connection is not shared with the workers
+        results = run_per_host(
+            jobs,
+            lambda job: urlsplit(job[1].url).netloc,
+            lambda job: _fetch_source(kind, *job),
+        )
+        rows = []
+        for (d, _), fetched in zip(jobs, results):
+            for bucket, sid, url, res in fetched:
+                if isinstance(res, Exception):
+                    fetch_errors[bucket] += 1
+                    _write_err(kind, d.id, sid, url, res)
+                    continue
+                rows.extend((run_date, d.id, d.name_zh, sid, it.title, it.url, it.published_at) for it in res)
+        # one executemany + one commit per kind
+        inserted[kind] += repo.insert_signals_many(table, rows)
+
+    # all fetching happens here; closing the client releases worker-thread sockets + cache db
+    with client:
+        _run_kind("news", bundle.news, "signals_news")
+        _run_kind("weather", bundle.weather, "signals_weather")
+        _run_kind("safety", bundle.safety, "signals_safety")
 
     # record run
     repo.record_run("daily", run_date)
@@ -303,24 +299,21 @@ def run_daily(run_date: str, *, force: bool = False) -> dict[str, Any]:
         err_file.write_text("# Source Errors (" + run_date + ")\n\n" + "\n".join(errors) + "\n", encoding="utf-8")
 
     # Build grouped report from DB (per city)
-    def _fetch(table: str) -> list[dict]:
-        cols = repo._table_cols(table)  # cached pragma
-        source_col = "source_id" if "source_id" in cols else ("source" if "source" in cols else None)
-        sel = ["city_code", "city_name_zh", "title", "url", "published_at", "created_at"]
-        if source_col:
-            sel.insert(2, f"{source_col} AS source_id")
-        q = f"SELECT {', '.join(sel)} FROM {table} WHERE run_date=?"
-        rows = repo.conn.execute(q, (run_date,)).fetchall()
-        out = []
-        for r in rows:
-            # tuple mapping by position
-            dct = {sel[i].split(" AS ")[-1]: r[i] for i in range(len(sel))}
-            out.append(dct)
-        return out
-
-    news_rows = _fetch("signals_news")
-    weather_rows = _fetch("signals_weather")
-    safety_rows = _fetch("signals_safety")
+    # all three tables in one UNION ALL; each row carries its section in `kind`,
+    # newest first by instant (ts_jd, see _report_select), so no Python sort is needed.
+    # rows are sqlite3.Row (connect_sqlite sets the row factory): r["title"] etc., no per-row dict
+    def _fetch() -> list[sqlite3.Row]:
+        source_cols = []
+        for _, table in _REPORT_TABLES:
+            cols = repo._table_cols(table)  # cached pragma
+            source_cols.append("source_id" if "source_id" in cols else ("source" if "source" in cols else None))
+        key = tuple(source_cols)
+        q = _FETCH_SQL.get(key)
+        if q is None:
+            q = _FETCH_SQL[key] = " UNION ALL ".join(
+                _report_select(kind, table, src) for (kind, table), src in zip(_REPORT_TABLES, source_cols)
+            ) + " ORDER BY ts_jd DESC"
+        return repo.conn.execute(q, {"run_date": run_date}).fetchall()
 
     by_city: dict[str, dict[str, Any]] = {}
     def _ensure(city_code: str, city_name_zh: str) -> dict[str, Any]:
@@ -328,16 +321,8 @@ def run_daily(run_date: str, *, force: bool = False) -> dict[str, Any]:
             by_city[city_code] = {"city_name_zh": city_name_zh, "news": [], "weather": [], "safety": []}
         return by_city[city_code]
 
-    for r in news_rows:
-        _ensure(r["city_code"], r["city_name_zh"])["news"].append(r)
-    for r in weather_rows:
-        _ensure(r["city_code"], r["city_name_zh"])["weather"].append(r)
-    for r in safety_rows:
-        _ensure(r["city_code"], r["city_name_zh"])["safety"].append(r)
-
-    for city_code, payload in by_city.items():
-        for k in ("news", "weather", "safety"):
-            payload[k].sort(key=lambda x: _dt_key(x.get("published_at"), x.get("created_at")), reverse=True)
+    for r in _fetch():
+        _ensure(r["city_code"], r["city_name_zh"])[r["kind"]].append(r)
 
     # Sections
     summary_lines = [
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import io
 import os
 import re
+from contextlib import ExitStack
 from datetime import date
 from pathlib import Path
+from urllib.parse import urlsplit
 
+from travel_tracker.core.concurrency import run_per_host
+from travel_tracker.core.fs import write_raw
 from travel_tracker.core.http_client import PoliteHttpClient
 from travel_tracker.storage.repository import Repository
 from travel_tracker.sources.flights.tripcom import load_tripcom_routes, fetch_route_html, TripcomRoute
@@ -24,24 +29,44 @@ def _env_float(name: str, default: float) -> float:
     except Exception:
         return default
 
+# bytes pattern: find <title> without decoding the page; only the title text is decoded
+_TITLE_RE = re.compile(rb"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+# from US$77 | from S$72 | from RM 55 | from ฿1,234 etc.
+_PRICE_RE = re.compile(r"\bfrom\s+((?:US\$|S\$|HK\$|NT\$|RM|฿|₱|¥|€|£))\s*([0-9][0-9,]*(?:\.[0-9]+)?)", re.IGNORECASE)
+_CUR_MAP = {
+    "US$": "USD",
+    "S$": "SGD",
+    "HK$": "HKD",
+    "NT$": "TWD",
+    "RM": "MYR",
+    "฿": "THB",
+    "₱": "PHP",
+    "¥": "JPY",
+    "€": "EUR",
+    "£": "GBP",
+}
+# <title> sits in <head>; scan only this much first
+_TITLE_SCAN_BYTES = 8192
+
+
 def _extract_min_price_from_title(html_bytes: bytes) -> tuple[int, str | None, float | None, str | None]:
     """
     Trip.com pages (often) include 'from US$77' in <title>.
     We parse that as a best-effort baseline.
     Returns: (parse_ok, currency, value, note)
     """
+    m = _TITLE_RE.search(html_bytes, 0, _TITLE_SCAN_BYTES)
+    if m is None and len(html_bytes) > _TITLE_SCAN_BYTES:
+        # long <head>: fall back to the whole page (still no full decode)
+        m = _TITLE_RE.search(html_bytes)
     try:
-        html = html_bytes.decode("utf-8", errors="ignore")
+        title = (m.group(1).decode("utf-8", errors="ignore").strip() if m else "")
     except Exception:
         return 0, None, None, "decode_failed"
-
-    m = re.search(r"<title[^>]*>(.*?)</title>", html, flags=re.IGNORECASE | re.DOTALL)
-    title = (m.group(1).strip() if m else "")
     if not title:
         return 0, None, None, "no_title"
 
-    # from US$77 | from S$72 | from RM 55 | from ฿1,234 etc.
-    mm = re.search(r"\bfrom\s+((?:US\$|S\$|HK\$|NT\$|RM|฿|₱|¥|€|£))\s*([0-9][0-9,]*(?:\.[0-9]+)?)", title, flags=re.IGNORECASE)
+    mm = _PRICE_RE.search(title)
     if not mm:
         return 0, None, None, "no_from_price_in_title"
 
@@ -52,21 +77,31 @@ def _extract_min_price_from_title(html_bytes: bytes) -> tuple[int, str | None, f
     except Exception:
         return 0, None, None, "price_parse_failed"
 
-    cur_map = {
-        "US$": "USD",
-        "S$": "SGD",
-        "HK$": "HKD",
-        "NT$": "TWD",
-        "RM": "MYR",
-        "฿": "THB",
-        "₱": "PHP",
-        "¥": "JPY",
-        "€": "EUR",
-        "£": "GBP",
-    }
-    cur = cur_map.get(cur_raw, cur_raw)
+    cur = _CUR_MAP.get(cur_raw, cur_raw)
     return 1, cur, val, "title_from_price"
 
+
+def _fetch_routes_pw(client: PoliteHttpClient, routes: list[TripcomRoute], raw_path_of) -> list[dict[str, object]]:
+    # Playwright: one browser for all routes, serial on this thread (sync API is thread-bound).
+    # import / launch failures do not abort the run: each route gets a fetch_error= note, as before.
+    with ExitStack() as stack:
+        try:
+            from travel_tracker.sources.flights.tripcom_pw import PlaywrightSession
+
+            pw = stack.enter_context(PlaywrightSession())
+        except Exception as e:
+            note = f"fetch_error={type(e).__name__}:{e}"
+            out: list[dict[str, object]] = []
+            for rt in routes:
+                write_raw(raw_path_of(rt), b"")
+                out.append({"source_url": rt.url, "status_code": None, "html_bytes": b"", "notes": note})
+            return out
+        return [
+            fetch_route_html(client=client, route=rt, raw_path=raw_path_of(rt), use_playwright=True, pw_session=pw)
+            for rt in routes
+        ]
+
+
 def run_flights(run_date: str | None = None, *, force: bool = False) -> dict[str, object]:
     run_date = run_date or _today_iso()
 
@@ -81,26 +116,50 @@ def run_flights(run_date: str | None = None, *, force: bool = False) -> dict[str
 
     client = PoliteHttpClient(cache_dir="data/cache/http", rps=rps, timeout_seconds=timeout, max_retries=retries)
     repo = Repository()
+    repo.init_schema()  # flights_quotes (no-op once present)
 
     inserted = 0
     total = 0
 
-    report_lines: list[str] = []
-    report_lines.append(f"# Flights Snapshot - {run_date}")
-    report_lines.append("")
-    report_lines.append("## Run Summary")
-    report_lines.append(f"- routes: {len(routes)}")
-    report_lines.append(f"- provider: tripcom")
-    report_lines.append(f"- use_playwright: {os.getenv('TRAVEL_FLIGHTS_USE_PW','')}")
-    report_lines.append("")
-
-    for rt in routes:
+    report = io.StringIO()
+    report.write(
+        f"# Flights Snapshot - {run_date}\n"
+        "\n"
+        "## Run Summary\n"
+        f"- routes: {len(routes)}\n"
+        f"- provider: tripcom\n"
+        f"- use_playwright: {os.getenv('TRAVEL_FLIGHTS_USE_PW','')}\n"
+        "\n"
+    )
+
+    def _raw_path(rt: TripcomRoute) -> Path:
+        return Path("data/raw") / run_date / "flights" / rt.origin / rt.destination / f"{rt.route_id}.html"
+
+    # fetch all routes first, several in flight at once; PoliteHttpClient still spaces
+    # request starts per host at TRAVEL_RPS.
+    use_pw = os.getenv("TRAVEL_FLIGHTS_USE_PW", "").strip() in {"1", "true", "yes", "on"}
+    try:
+        if use_pw:
+            results = _fetch_routes_pw(client, routes, _raw_path)
+        else:
+            # TRAVEL_FLIGHTS_CONCURRENCY spans hosts; one host (URL netloc) never gets more than 2 at once
+            concurrency = max(1, _env_int("TRAVEL_FLIGHTS_CONCURRENCY", 4))
+            results = run_per_host(
+                routes,
+                lambda rt: urlsplit(rt.url).netloc,
+                lambda rt: fetch_route_html(client=client, route=rt, raw_path=_raw_path(rt)),
+                max_concurrency=concurrency,
+                per_host=min(2, concurrency),
+            )
+    finally:
+        # all fetching is done: release keep-alive sockets (worker threads too) + cache db
+        client.close()
+
+    # parse on this thread; rows are written in one batch at the end
+    quotes: list[dict[str, object]] = []
+    for rt, res in zip(routes, results):
         total += 1
-
-        raw_dir = Path("data/raw") / run_date / "flights" / rt.origin / rt.destination
-        raw_path = raw_dir / f"{rt.route_id}.html"
-
-        res = fetch_route_html(client=client, route=rt, raw_path=raw_path)
+        raw_path = _raw_path(rt)
 
         html_bytes = res.get("html_bytes") if isinstance(res, dict) else b""
         if not isinstance(html_bytes, (bytes, bytearray)):
@@ -147,23 +206,25 @@ def run_flights(run_date: str | None = None, *, force: bool = False) -> dict[str
 
         payload_db.pop('raw_file', None)
 
-        repo.insert_flight_quote(**payload_db)
-        inserted += 1
+        quotes.append(payload_db)
 
-        report_lines.append(f"### {rt.route_id} {rt.origin}->{rt.destination}")
-        report_lines.append(f"- status_code: {status_code}")
-        report_lines.append(f"- parse_ok: {parse_ok}")
-        report_lines.append(f"- min_price: {cur or ''} {val or ''}")
-        report_lines.append(f"- source: {payload['source_url']}")
-        report_lines.append(f"- raw: {raw_path}")
-        report_lines.append("")
+        report.write(
+            f"### {rt.route_id} {rt.origin}->{rt.destination}\n"
+            f"- status_code: {status_code}\n"
+            f"- parse_ok: {parse_ok}\n"
+            f"- min_price: {cur or ''} {val or ''}\n"
+            f"- source: {payload['source_url']}\n"
+            f"- raw: {raw_path}\n"
+            "\n"
+        )
 
-    repo.commit()
+    # one executemany + one commit; OR REPLACE so a rerun refreshes the day's quote per route
+    inserted = repo.insert_many("flights_quotes", quotes, replace=True)
     repo.close()
 
     out = Path("reports/daily")
     out.mkdir(parents=True, exist_ok=True)
     report_path = out / f"flights_{run_date}.md"
-    report_path.write_text("\n".join(report_lines).strip() + "\n", encoding="utf-8")
+    report_path.write_text(report.getvalue().strip() + "\n", encoding="utf-8")
 
     return {"run_date": run_date, "routes": len(routes), "inserted": inserted, "report": str(report_path)}
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import csv
+import io
+import sqlite3
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List
 
 from travel_tracker.storage.db import connect_sqlite
 
@@ -14,10 +17,13 @@ class Dest:
     name_zh: str
 
 
+@lru_cache(maxsize=1)
 def _load_destinations_map() -> Dict[str, str]:
     """
     盡量用現有 config/destinations.json（你前面已經有 20 cities）
     若不存在就回傳空 dict（fallback: 只顯示 IATA code）
+    - read once per process (static config); shared dict -> read-only.
+      reload: _load_destinations_map.cache_clear()
     """
     p = Path("config/destinations.json")
     if not p.exists():
@@ -34,130 +40,106 @@ def _load_destinations_map() -> Dict[str, str]:
     return out
 
 
-def _query_rows(run_date: str, provider: str) -> List[dict]:
+# (run_date, provider) equality, then (origin, destination) partitions in index order
+FQ_INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS ix_fq_rd_prov
+  ON flights_quotes(run_date, provider, origin, destination, min_price_value);
+""".strip()
+
+# Best row per origin->destination, picked by SQLite (window function, SQLite >= 3.25):
+# - 同一個 origin->destination 可能有多個 route_id（或將來你加更多 provider）
+# - 取 parse_ok=1 且 min_price_value 最低者；都沒有的話取第一個 route_id（報表顯示為未解析）
+# Result is ordered for the report: per origin, ok first, then price asc, then destination.
+_BEST_SQL = """
+SELECT provider, origin, destination, route_id, status_code, parse_ok,
+       min_price_currency, min_price_value, source_url, created_at
+FROM (
+  SELECT *,
+         ROW_NUMBER() OVER (
+           PARTITION BY origin, destination
+           ORDER BY ok DESC, CASE WHEN ok THEN CAST(min_price_value AS REAL) END, route_id
+         ) AS rn
+  FROM (
+    SELECT *, (parse_ok = 1 AND min_price_value IS NOT NULL) AS ok
+    FROM flights_quotes
+    WHERE run_date = ?
+      AND provider = ?
+  )
+)
+WHERE rn = 1
+ORDER BY origin, ok DESC, CASE WHEN ok THEN CAST(min_price_value AS REAL) END, destination;
+"""
+
+
+def _query_best_rows(run_date: str, provider: str) -> List[sqlite3.Row]:
     conn = connect_sqlite()
     try:
-        # 1 row per (run_date, provider, origin, destination, route_id) because you UPSERTed
-        sql = """
-        SELECT
-          provider,
-          origin,
-          destination,
-          route_id,
-          status_code,
-          parse_ok,
-          min_price_currency,
-          min_price_value,
-          source_url,
-          created_at
-        FROM flights_quotes
-        WHERE run_date = ?
-          AND provider = ?
-        ORDER BY origin, destination, route_id;
-        """
-        rows = conn.execute(sql, (run_date, provider)).fetchall()
-        cols = [d[0] for d in conn.execute("PRAGMA table_info(flights_quotes);").fetchall()]  # not used, keep simple
-        # sqlite rows are tuples; map manually by select order:
-        out = []
-        for r in rows:
-            out.append(
-                dict(
-                    provider=r[0],
-                    origin=r[1],
-                    destination=r[2],
-                    route_id=r[3],
-                    status_code=r[4],
-                    parse_ok=r[5],
-                    min_price_currency=r[6],
-                    min_price_value=r[7],
-                    source_url=r[8],
-                    created_at=r[9],
-                )
-            )
-        return out
+        conn.execute(FQ_INDEX_SQL)
+        # sqlite3.Row (connect_sqlite row_factory): r["origin"] etc., no per-row dict
+        return conn.execute(_BEST_SQL, (run_date, provider)).fetchall()
     finally:
         conn.close()
 
 
-def _best_by_pair(rows: List[dict]) -> Dict[Tuple[str, str], dict]:
-    """
-    同一個 origin->destination 可能有多個 route_id（或將來你加更多 provider）。
-    這裡取 parse_ok=1 且 min_price_value 最低者；若都沒有 parse_ok=1，就留空。
-    """
-    best: Dict[Tuple[str, str], dict] = {}
-    for r in rows:
-        k = (r["origin"], r["destination"])
-        ok = (r.get("parse_ok") == 1) and (r.get("min_price_value") is not None)
-        if k not in best:
-            best[k] = r
-            continue
-        cur = best[k]
-        cur_ok = (cur.get("parse_ok") == 1) and (cur.get("min_price_value") is not None)
-        if ok and (not cur_ok):
-            best[k] = r
-        elif ok and cur_ok:
-            if float(r["min_price_value"]) < float(cur["min_price_value"]):
-                best[k] = r
-    return best
+def _md_row(d, name, val_str, cur, ok, st, link, updated) -> str:
+    # fixed column shape: one template, no per-row branching
+    return f"| {d} | {name} | {val_str} | {cur} | {ok} | {st} | {link} | {updated} |"
 
 
-def write_flights_summary(run_date: str, provider: str = "tripcom", top_n: int = 20) -> dict:
-    dest_map = _load_destinations_map()
-    rows = _query_rows(run_date, provider)
-    best = _best_by_pair(rows)
-
-    # group by origin
-    by_origin: Dict[str, List[dict]] = {}
-    for (o, d), r in best.items():
-        by_origin.setdefault(o, []).append(r)
+def _price_str(val) -> str:
+    # exact type check: SQLite hands back int/float/str/None only
+    if type(val) in (int, float):
+        return format(val, ".2f")
+    return "" if val is None else str(val)
 
-    # sort inside each origin by price (ok first, then price asc)
-    def key_price(r: dict):
-        ok = (r.get("parse_ok") == 1) and (r.get("min_price_value") is not None)
-        price = float(r["min_price_value"]) if ok else 1e18
-        return (0 if ok else 1, price)
 
-    for o in by_origin:
-        by_origin[o].sort(key=key_price)
+def write_flights_summary(run_date: str, provider: str = "tripcom", top_n: int = 20) -> dict:
+    dest_map = _load_destinations_map()
+    # group by origin (rows arrive already sorted: ok first, then price asc)
+    by_origin: Dict[str, List[sqlite3.Row]] = {}
+    for r in _query_best_rows(run_date, provider):
+        by_origin.setdefault(r["origin"], []).append(r)
 
     # write CSV (all best pairs)
     csv_path = Path(f"reports/tables/flights_summary_{run_date}.csv")
     csv_path.parent.mkdir(parents=True, exist_ok=True)
-    with csv_path.open("w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow(
-            [
-                "run_date",
-                "provider",
-                "origin",
-                "destination",
-                "destination_name_zh",
-                "parse_ok",
-                "status_code",
-                "min_price_currency",
-                "min_price_value",
-                "source_url",
-                "created_at",
-            ]
-        )
-        for o in sorted(by_origin.keys()):
-            for r in by_origin[o]:
-                d = (r.get("destination") or "").upper()
-                w.writerow(
-                    [
-                        run_date,
-                        provider,
-                        r.get("origin"),
-                        d,
-                        dest_map.get(d, d),
-                        r.get("parse_ok"),
-                        r.get("status_code"),
-                        r.get("min_price_currency"),
-                        r.get("min_price_value"),
-                        r.get("source_url"),
-                        r.get("created_at"),
-                    ]
-                )
+    # rows go to an in-memory buffer, then one write (csv keeps its \r\n terminators: bytes, no newline translation)
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    w.writerow(
+        [
+            "run_date",
+            "provider",
+            "origin",
+            "destination",
+            "destination_name_zh",
+            "parse_ok",
+            "status_code",
+            "min_price_currency",
+            "min_price_value",
+            "source_url",
+            "created_at",
+        ]
+    )
+    for o in sorted(by_origin.keys()):
+        for r in by_origin[o]:
+            d = (r["destination"] or "").upper()
+            w.writerow(
+                [
+                    run_date,
+                    provider,
+                    r["origin"],
+                    d,
+                    dest_map.get(d, d),
+                    r["parse_ok"],
+                    r["status_code"],
+                    r["min_price_currency"],
+                    r["min_price_value"],
+                    r["source_url"],
+                    r["created_at"],
+                ]
+            )
+    csv_path.write_bytes(buf.getvalue().encode("utf-8"))
 
     # write Markdown (Top N per origin)
     md_path = Path(f"reports/daily/flights_summary_{run_date}.md")
@@ -176,17 +158,20 @@ def write_flights_summary(run_date: str, provider: str = "tripcom", top_n: int =
         lines.append("| Destination | Name(zh) | Min Price | Currency | OK | Status | Link | Updated |")
         lines.append("|---|---|---:|---|---:|---:|---|---|")
         for r in by_origin[o][:top_n]:
-            d = (r.get("destination") or "").upper()
-            name = dest_map.get(d, d)
-            ok = r.get("parse_ok") or 0
-            st = r.get("status_code") or ""
-            cur = r.get("min_price_currency") or ""
-            val = r.get("min_price_value")
-            val_str = f"{val:.2f}" if isinstance(val, (int, float)) else (str(val) if val is not None else "")
-            link = r.get("source_url") or ""
-            updated = r.get("created_at") or ""
-            lines.append(f"| {d} | {name} | {val_str} | {cur} | {ok} | {st} | {link} | {updated} |")
+            d = (r["destination"] or "").upper()
+            lines.append(
+                _md_row(
+                    d,
+                    dest_map.get(d, d),
+                    _price_str(r["min_price_value"]),
+                    r["min_price_currency"] or "",
+                    r["parse_ok"] or 0,
+                    r["status_code"] or "",
+                    r["source_url"] or "",
+                    r["created_at"] or "",
+                )
+            )
         lines.append("")
 
-    md_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    md_path.write_bytes(("\n".join(lines) + "\n").encode("utf-8"))
     return {"md": str(md_path), "csv": str(csv_path), "pairs": sum(len(v) for v in by_origin.values())}
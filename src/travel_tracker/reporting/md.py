@@ -1,4 +1,5 @@
 from __future__ import annotations
+import io
 from typing import Iterable, Sequence
 
 def h2(title: str) -> str:
@@ -16,16 +17,27 @@ def bullets(items: Iterable[str]) -> str:
         return "_No data_\n"
     return "\n".join([f"- {x}" for x in items]) + "\n"
 
+# line breaks -> space in one translate pass ("|" needs two chars: replaced only when present)
+_ESCAPE_TABLE = str.maketrans({"\n": " ", "\r": " "})
+
 def _escape_cell(x: object) -> str:
     s = "" if x is None else str(x)
-    return s.replace("\n", " ").replace("|", "\\|").strip()
+    s = s.translate(_ESCAPE_TABLE)
+    if "|" in s:
+        s = s.replace("|", "\\|")
+    return s.strip()
 
 def table(headers: Sequence[str], rows: Sequence[Sequence[object]]) -> str:
-    headers = [_escape_cell(h) for h in headers]
-    out = []
-    out.append("| " + " | ".join(headers) + " |")
-    out.append("| " + " | ".join(["---"] * len(headers)) + " |")
+    # written straight into one buffer (no per-row list / out list)
+    buf = io.StringIO()
+    w = buf.write
+    w("| ")
+    w(" | ".join(_escape_cell(h) for h in headers))
+    w(" |\n| ")
+    w(" | ".join(["---"] * len(headers)))
+    w(" |\n")
     for r in rows:
-        rr = [_escape_cell(c) for c in r]
-        out.append("| " + " | ".join(rr) + " |")
-    return "\n".join(out) + "\n"
+        w("| ")
+        w(" | ".join(_escape_cell(c) for c in r))
+        w(" |\n")
+    return buf.getvalue()
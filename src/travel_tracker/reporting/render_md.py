@@ -22,5 +22,6 @@ def write_markdown_report(out_dir: Path, filename: str, title: str, sections: li
             lines.append(body.rstrip())
             lines.append("")
 
-    out.write_text("\n".join(lines).rstrip() + "\n", encoding="utf-8")
+    # encode once, write bytes (no text-layer pass; "\n" line endings on every OS)
+    out.write_bytes(("\n".join(lines).rstrip() + "\n").encode("utf-8"))
     return out
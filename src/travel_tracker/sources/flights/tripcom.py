@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from travel_tracker.core.fs import write_raw
 from travel_tracker.core.http_client import PoliteHttpClient
 
 @dataclass(frozen=True)
@@ -49,6 +50,7 @@ def fetch_route_html(
     route: TripcomRoute,
     raw_path: Path,
     use_playwright: bool | None = None,
+    pw_session: Any = None,
 ) -> dict[str, object]:
     """
     Canonical return:
@@ -58,6 +60,7 @@ def fetch_route_html(
         "html_bytes": bytes,
         "notes": str|None,
       }
+    pw_session: an open PlaywrightSession to reuse (else one browser per call)
     """
     if use_playwright is None:
         use_playwright = os.getenv("TRAVEL_FLIGHTS_USE_PW", "").strip() in {"1", "true", "yes", "on"}
@@ -69,8 +72,12 @@ def fetch_route_html(
 
     try:
         if use_playwright:
-            from travel_tracker.sources.flights.tripcom_pw import fetch_html
-            html_bytes = fetch_html(url, timeout_seconds=int(os.getenv("TRAVEL_TIMEOUT", "20")))
+            timeout_seconds = int(os.getenv("TRAVEL_TIMEOUT", "20"))
+            if pw_session is not None:
+                html_bytes = pw_session.fetch(url, timeout_seconds=timeout_seconds)
+            else:
+                from travel_tracker.sources.flights.tripcom_pw import fetch_html
+                html_bytes = fetch_html(url, timeout_seconds=timeout_seconds)
             status_code = 200
             notes = "pw=1"
         else:
@@ -85,8 +92,7 @@ def fetch_route_html(
         html_bytes = b""
         status_code = status_code or None
 
-    raw_path.parent.mkdir(parents=True, exist_ok=True)
-    raw_path.write_bytes(html_bytes)
+    write_raw(raw_path, html_bytes)
 
     return {
         "source_url": url,
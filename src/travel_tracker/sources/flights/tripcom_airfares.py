@@ -6,7 +6,10 @@ from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any
+from urllib.parse import urlsplit
 
+from travel_tracker.core.concurrency import run_per_host
+from travel_tracker.core.fs import write_raw
 from travel_tracker.core.http_client import PoliteHttpClient
 
 
@@ -30,30 +33,61 @@ def _safe_slug(s: str) -> str:
     return re.sub(r"[^A-Za-z0-9._-]+", "_", s).strip("_")
 
 
-def _extract_currency_and_price(html: str) -> tuple[str | None, float | None]:
+# patterns compiled once at import (markup changes often -> several fallbacks, tried in order)
+_NUM = r"([0-9]{1,3}(?:,[0-9]{3})*(?:\.[0-9]+)?)"
+
+# str `\s` on bytes: ASCII whitespace + UTF-8 of the non-ASCII chars str patterns treat as \s
+_WS = b"(?:[\t\n\x0b\x0c\r\x1c-\x1f ]|" + b"|".join(
+    re.escape(ch.encode("utf-8")) for ch in "\x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005"
+    "\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000"
+) + b")*"
+
+# Step 1 in one pass over the raw page bytes (no decode): JSON-like price keys
+# ("lowestPrice" / "minPrice" / "price" / "amount") and the JSON currency (e.g.
+# "currency":"SGD"). Both branches start with a quoted key, so their matches never
+# overlap: one finditer sees what five scans did.
+_JSON_RE = re.compile(
+    rb'"(?:lowestPrice|minPrice|price|amount)"' + _WS + rb":" + _WS + rb"(?P<price>[0-9]+(?:\.[0-9]+)?)"
+    rb'|"currency"' + _WS + rb":" + _WS + rb'"(?P<cur>[A-Z]{3})"'
+)
+# Fallbacks below can overlap each other ("XRM 5" vs "RM 5", "S$5" vs "$5") and are tried
+# in priority order, so they stay separate searches; they only run when step 1 fails,
+# on the decoded text (`\b` needs Unicode word chars).
+# explicit 3-letter currency + number, e.g. "SGD 123"
+_ISO_PRICE_RE = re.compile(rf"\b([A-Z]{{3}})\s*{_NUM}\b")
+# text currency symbols + number, e.g. "S$123", "RM 456"
+_SYM_RES = tuple(
+    (cur, re.compile(re.escape(sym) + rf"\s*{_NUM}"))
+    for sym, cur in {
+        "S$": "SGD",
+        "RM": "MYR",
+        "฿": "THB",
+        "NT$": "TWD",
+        "Rp": "IDR",
+        "₱": "PHP",
+        "₫": "VND",
+        "¥": "JPY",
+    }.items()
+)
+# Dollar sign ambiguous: currency None
+_DOLLAR_RE = re.compile(rf"\$\s*{_NUM}")
+
+
+def _extract_currency_and_price(body: bytes) -> tuple[str | None, float | None]:
     """
-    Best-effort extraction for Trip.com airfares pages.
+    Best-effort extraction for Trip.com airfares pages (raw response bytes).
     We try multiple patterns because markup changes frequently.
     """
 
     # 1) Try to find embedded JSON blobs with price fields (common on OTA pages)
     # Look for "lowestPrice" / "minPrice" / "price" near currency.
     candidates = []
-
-    # JSON-like key/value patterns
-    json_price_patterns = [
-        r'"lowestPrice"\s*:\s*([0-9]+(?:\.[0-9]+)?)',
-        r'"minPrice"\s*:\s*([0-9]+(?:\.[0-9]+)?)',
-        r'"price"\s*:\s*([0-9]+(?:\.[0-9]+)?)',
-        r'"amount"\s*:\s*([0-9]+(?:\.[0-9]+)?)',
-    ]
-    for pat in json_price_patterns:
-        for m in re.finditer(pat, html):
-            candidates.append(m.group(1))
-
-    # Currency patterns in JSON (e.g. "currency":"SGD")
-    mcur = re.search(r'"currency"\s*:\s*"([A-Z]{3})"', html)
-    currency = mcur.group(1) if mcur else None
+    currency = None
+    for m in _JSON_RE.finditer(body):
+        if m.lastgroup == "price":
+            candidates.append(m.group("price"))  # float() accepts ASCII bytes
+        elif currency is None:
+            currency = m.group("cur").decode("ascii")
 
     # If we got numeric candidates, choose the smallest plausible one (>0)
     price = None
@@ -69,20 +103,10 @@ def _extract_currency_and_price(html: str) -> tuple[str | None, float | None]:
         return currency, price
 
     # 2) Fallback: text currency symbols + number
-    # Examples: "S$123", "RM 456", "$789" (ambiguous), "SGD 123"
-    sym_map = {
-        "S$": "SGD",
-        "RM": "MYR",
-        "฿": "THB",
-        "NT$": "TWD",
-        "Rp": "IDR",
-        "₱": "PHP",
-        "₫": "VND",
-        "¥": "JPY",
-    }
+    html = body.decode("utf-8", errors="replace")
 
     # Prefer explicit 3-letter currencies
-    m = re.search(r"\b([A-Z]{3})\s*([0-9]{1,3}(?:,[0-9]{3})*(?:\.[0-9]+)?)\b", html)
+    m = _ISO_PRICE_RE.search(html)
     if m:
         c = m.group(1)
         p = float(m.group(2).replace(",", ""))
@@ -90,15 +114,14 @@ def _extract_currency_and_price(html: str) -> tuple[str | None, float | None]:
             return c, p
 
     # Symbols
-    for sym, cur in sym_map.items():
-        m2 = re.search(re.escape(sym) + r"\s*([0-9]{1,3}(?:,[0-9]{3})*(?:\.[0-9]+)?)", html)
+    for cur, pat in _SYM_RES:
+        m2 = pat.search(html)
         if m2:
             p = float(m2.group(1).replace(",", ""))
             if p > 0:
                 return cur, p
 
-    # Dollar sign ambiguous: treat as None currency
-    m3 = re.search(r"\$\s*([0-9]{1,3}(?:,[0-9]{3})*(?:\.[0-9]+)?)", html)
+    m3 = _DOLLAR_RE.search(html)
     if m3:
         p = float(m3.group(1).replace(",", ""))
         if p > 0:
@@ -121,10 +144,19 @@ def fetch_tripcom_airfares_deals(
     client: PoliteHttpClient,
     raw_dir: Path,
     routes: list[dict[str, Any]],
+    max_concurrency: int = 8,
+    per_host: int = 2,
 ) -> list[FlightDeal]:
-    deals: list[FlightDeal] = []
+    """
+    Fetch + parse every valid route; independent GETs overlap in worker threads.
+    - at most per_host requests in flight per host (all routes are on trip.com: keep it 1-2);
+      max_concurrency only matters across hosts
+    - PoliteHttpClient still spaces request starts per host (rps)
+    - deals keep the order of `routes`
+    """
     raw_dir.mkdir(parents=True, exist_ok=True)
 
+    jobs: list[tuple[str, str, str, str]] = []
     for r in routes:
         sid = str(r.get("id") or "")
         origin = str(r.get("origin") or "").upper()
@@ -133,29 +165,33 @@ def fetch_tripcom_airfares_deals(
 
         if not (sid and origin and dest and url):
             continue
+        jobs.append((sid, origin, dest, url))
 
+    # one route: fetch, save raw, parse (runs in a worker thread)
+    def _one(job: tuple[str, str, str, str]) -> FlightDeal:
+        sid, origin, dest, url = job
         resp = client.get(url)
-        html = (resp.body or b"").decode("utf-8", errors="replace")
-
-        # Save raw
-        out = raw_dir / origin / f"{_safe_slug(sid)}.html"
-        out.parent.mkdir(parents=True, exist_ok=True)
-        out.write_text(html, encoding="utf-8")
-
-        cur, price = _extract_currency_and_price(html)
-        title = f"Trip.com airfares {origin}->{dest}"
-
-        deals.append(
-            FlightDeal(
-                source_id=sid,
-                origin=origin,
-                destination=dest,
-                title=title,
-                url=url,
-                price=price,
-                currency=cur,
-                observed_at=_now_iso(),
-            )
+        body = resp.body or b""
+
+        # Save raw (bytes as received; no decode / re-encode round trip)
+        write_raw(raw_dir / origin / f"{_safe_slug(sid)}.html", body)
+
+        cur, price = _extract_currency_and_price(body)
+        return FlightDeal(
+            source_id=sid,
+            origin=origin,
+            destination=dest,
+            title=f"Trip.com airfares {origin}->{dest}",
+            url=url,
+            price=price,
+            currency=cur,
+            observed_at=_now_iso(),
         )
 
-    return deals
+    return run_per_host(
+        jobs,
+        lambda job: urlsplit(job[3]).netloc,
+        _one,
+        max_concurrency=max_concurrency,
+        per_host=per_host,
+    )
@@ -2,29 +2,76 @@ from __future__ import annotations
 
 import os
 
-def fetch_html(url: str, *, timeout_seconds: int = 20) -> bytes:
-    """
-    Fetch fully-rendered HTML via Playwright.
-    Used when TRAVEL_FLIGHTS_USE_PW=1.
-    """
-    # Lazy import to keep normal runs light.
-    from playwright.sync_api import sync_playwright
 
-    # Tight defaults; keep it stable.
-    ua = os.getenv(
+def _user_agent() -> str:
+    return os.getenv(
         "TRAVEL_PW_UA",
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
         "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36",
     )
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        ctx = browser.new_context(user_agent=ua, viewport={"width": 1280, "height": 720})
-        page = ctx.new_page()
-        page.goto(url, wait_until="domcontentloaded", timeout=timeout_seconds * 1000)
-        # give SPA a short breath (avoid infinite waits)
-        page.wait_for_timeout(1200)
-        html = page.content()
-        ctx.close()
-        browser.close()
-    return html.encode("utf-8", errors="ignore")
+
+class PlaywrightSession:
+    """
+    One Chromium + context for many pages (launch cost paid once per run).
+    - with PlaywrightSession() as pw: pw.fetch(url)
+    - sync API: use it from the thread that opened it
+    """
+    def __init__(self) -> None:
+        self._p = None
+        self.browser = None
+        self.ctx = None
+
+    def __enter__(self) -> PlaywrightSession:
+        # Lazy import to keep normal runs light.
+        from playwright.sync_api import sync_playwright
+
+        self._p = sync_playwright().start()
+        try:
+            self.browser = self._p.chromium.launch(headless=True)
+            # Tight defaults; keep it stable.
+            self.ctx = self.browser.new_context(user_agent=_user_agent(), viewport={"width": 1280, "height": 720})
+        except Exception:
+            self.close()
+            raise
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.ctx is not None:
+            self.ctx.close()
+            self.ctx = None
+        if self.browser is not None:
+            self.browser.close()
+            self.browser = None
+        if self._p is not None:
+            self._p.stop()
+            self._p = None
+
+    def fetch(self, url: str, *, timeout_seconds: int = 20) -> bytes:
+        from playwright.sync_api import TimeoutError as PWTimeoutError
+
+        page = self.ctx.new_page()
+        try:
+            page.goto(url, wait_until="domcontentloaded", timeout=timeout_seconds * 1000)
+            # give SPA a short breath: returns as soon as the network is idle, capped at 3s
+            try:
+                page.wait_for_load_state("networkidle", timeout=3000)
+            except PWTimeoutError:
+                pass
+            html = page.content()
+        finally:
+            page.close()
+        return html.encode("utf-8", errors="ignore")
+
+
+def fetch_html(url: str, *, timeout_seconds: int = 20) -> bytes:
+    """
+    Fetch fully-rendered HTML via Playwright.
+    Used when TRAVEL_FLIGHTS_USE_PW=1.
+    One-off: launches a browser for this page only (many pages -> PlaywrightSession).
+    """
+    with PlaywrightSession() as pw:
+        return pw.fetch(url, timeout_seconds=timeout_seconds)
@@ -1,22 +1,52 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
 
 from travel_tracker.core.http_client import PoliteHttpClient
 from travel_tracker.core.feed_parsers import parse_opml, parse_any_feed, FeedItem
 
 
+# parsed feed items live in the HTTP cache under the feed URL (PoliteHttpClient.save_parsed),
+# so an unchanged feed (304) is not re-parsed on any later run, whatever day's raw dir it uses.
+# bump the version when FeedItem parsing changes so old entries are ignored
+_ITEMS_KIND = "feed_items/v1"
+
+
+def _load_items(client: PoliteHttpClient, url: str) -> list[FeedItem] | None:
+    data = client.load_parsed(url, _ITEMS_KIND)
+    if data is None:
+        return None
+    try:
+        return [FeedItem(title=d["title"], url=d["url"], published_at=d.get("published_at")) for d in json.loads(data)]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _save_items(client: PoliteHttpClient, url: str, items: list[FeedItem]) -> None:
+    data = [{"title": it.title, "url": it.url, "published_at": it.published_at} for it in items]
+    client.save_parsed(url, _ITEMS_KIND, json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+
 def fetch_items(*, client: PoliteHttpClient, url: str, source_type: str, raw_path: Path) -> tuple[list[FeedItem], list[str]]:
     """
     Returns (items, expanded_feed_urls)
     - If OPML: expanded_feed_urls will have child RSS URLs; items empty.
     - Else: tries RSS/Atom/CAP auto-detect.
+    - HTTP 304 (ETag / Last-Modified unchanged) + items parsed from that body on an
+      earlier run: reuse them, no re-parse (the raw file is still written for this run).
     """
     resp = client.get(url)
+    st = (source_type or "").lower()
+
     raw_path.parent.mkdir(parents=True, exist_ok=True)
     raw_path.write_bytes(resp.body)
 
-    st = (source_type or "").lower()
+    if resp.status == 304 and st != "opml":
+        cached = _load_items(client, url)
+        if cached is not None:
+            return cached, []
+
     if st == "opml":
         return [], parse_opml(resp.body)
 
@@ -29,4 +59,5 @@ def fetch_items(*, client: PoliteHttpClient, url: str, source_type: str, raw_pat
             url=it.url or url,
             published_at=it.published_at
         ))
+    _save_items(client, url, fixed)
     return fixed, []
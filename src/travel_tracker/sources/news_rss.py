@@ -1,8 +1,18 @@
 from __future__ import annotations
+import atexit
 from dataclasses import dataclass
-from typing import Iterable
-import feedparser
 from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Iterable
+
+from travel_tracker.core.feed_parsers import iterparse_rss_or_atom
+from travel_tracker.core.http_client import PoliteHttpClient
+
+try:
+    # lenient fallback for feeds the XML parser rejects (bad encodings, broken markup)
+    import feedparser
+except ImportError:
+    feedparser = None
 
 @dataclass(frozen=True)
 class NewsSource:
@@ -11,39 +21,54 @@ class NewsSource:
     source: str
     rss_url: str
 
-def _to_iso(dt) -> str | None:
-    if not dt:
+@lru_cache(maxsize=1)
+def _default_client() -> PoliteHttpClient:
+    # same politeness / cache settings as the daily snapshot (ETag/Last-Modified cache in data/cache/http)
+    # only for callers that pass no client; pipelines bring (and close) their own
+    client = PoliteHttpClient(cache_dir="data/cache/http", rps=0.2, timeout_seconds=8, max_retries=1)
+    atexit.register(client.close)
+    return client
+
+def _to_iso(s: str | None) -> str | None:
+    if not s:
         return None
     try:
-        return dt.isoformat(timespec="seconds")
+        return parsedate_to_datetime(s).isoformat(timespec="seconds")
     except Exception:
         return None
 
-def fetch_rss_items(src: NewsSource) -> Iterable[dict]:
-    d = feedparser.parse(src.rss_url)
+def _feedparser_entries(body: bytes) -> list[tuple[str, str, str | None]]:
+    d = feedparser.parse(body)
+    out = []
     for e in getattr(d, "entries", []) or []:
-        title = (getattr(e, "title", None) or "").strip()
-        url = (getattr(e, "link", None) or "").strip()
-        if not title or not url:
-            continue
-
-        published = None
-        if getattr(e, "published", None):
-            try:
-                published = parsedate_to_datetime(e.published)
-            except Exception:
-                published = None
-        elif getattr(e, "updated", None):
-            try:
-                published = parsedate_to_datetime(e.updated)
-            except Exception:
-                published = None
+        title = (e.get("title") or "").strip()
+        url = (e.get("link") or "").strip()
+        if title and url:
+            out.append((title, url, _to_iso(e.get("published") or e.get("updated"))))
+    return out
 
+def fetch_rss_items(src: NewsSource, client: PoliteHttpClient | None = None) -> Iterable[dict]:
+    """
+    RSS 2.0 / RSS 1.0 (RDF) / Atom entries of one source.
+    - entries without title or link are skipped
+    - parsed with a recovering parser when lxml is installed (&nbsp;, sloppy markup);
+      a feed it still rejects goes through feedparser when that is installed
+    - fetch / parse errors raise: the caller counts them per source
+    """
+    body = (client or _default_client()).get(src.rss_url).body
+    try:
+        # whole feed first: a parse error half-way must not leave a cut-off list
+        entries = [(it.title, it.url, it.published_at) for it in iterparse_rss_or_atom(body, strict=True, recover=True)]
+    except Exception:
+        if feedparser is None:
+            raise
+        entries = _feedparser_entries(body)
+    for title, url, published_at in entries:
         yield {
             "city": src.city,
             "topic": src.topic,
             "source": src.source,
             "title": title,
             "url": url,
-            "published_at": _to_iso(published),
+            "published_at": published_at,
         }
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from pathlib import Path
+from typing import Iterable
 
 
 @dataclass
@@ -21,6 +23,41 @@ class Source:
     tags: list[str]
 
 
+@dataclass(frozen=True)
+class CityIndex:
+    """
+    Lookup for city tokens (TRAVEL_LIMIT_CITIES):
+    - by_id: code (upper) -> Destination
+    - by_zh: name_zh (臺/台 both spellings) -> Destination
+    """
+    by_id: dict[str, Destination]
+    by_zh: dict[str, Destination]
+
+    @classmethod
+    def build(cls, destinations: Iterable[Destination]) -> CityIndex:
+        by_id: dict[str, Destination] = {}
+        by_zh: dict[str, Destination] = {}
+        for d in destinations:
+            by_id[(d.id or "").upper()] = d
+            name = (d.name_zh or "").strip()
+            if name:
+                by_zh[name] = d
+                by_zh[name.replace("臺", "台")] = d
+        return cls(by_id=by_id, by_zh=by_zh)
+
+    def resolve(self, tokens: Iterable[str]) -> tuple[list[Destination], list[str]]:
+        """tokens -> (destinations in token order, de-duplicated by id; unknown tokens)"""
+        chosen: dict[str, Destination] = {}
+        unknown: list[str] = []
+        for t in tokens:
+            d = self.by_id.get(t.upper()) or self.by_zh.get(t) or self.by_zh.get(t.replace("臺", "台"))
+            if d is None:
+                unknown.append(t)
+            elif d.id and d.id not in chosen:
+                chosen[d.id] = d
+        return list(chosen.values()), unknown
+
+
 @dataclass
 class SourcesBundle:
     destinations: list[Destination]
@@ -28,7 +65,13 @@ class SourcesBundle:
     weather: list[Source]
     safety: list[Source]
 
+    @cached_property
+    def city_index(self) -> CityIndex:
+        return CityIndex.build(self.destinations)
+
 
+# sources.json is static for a run: parse once per path. The bundle is shared -> treat it as read-only.
+@lru_cache(maxsize=1)
 def load_sources(path: str = "data/sources.json") -> SourcesBundle:
     p = Path(path)
     if not p.exists():
@@ -3,9 +3,37 @@ from pathlib import Path
 
 SQLITE_PATH = "data/db/travel_tracker.sqlite"
 
+# WAL: commits append to the log (no rollback-journal rewrite); NORMAL: fsync at checkpoint only.
+# Transactions stay with the sqlite3 module (implicit BEGIN, `with conn:` commits) so
+# executemany batches are still one transaction each.
+_RW_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-65536;
+PRAGMA mmap_size=268435456;
+"""
+
+# report readers: mmap the file, 64 MiB page cache, temp b-trees in RAM, refuse writes
+_RO_PRAGMAS = """
+PRAGMA mmap_size=268435456;
+PRAGMA cache_size=-65536;
+PRAGMA temp_store=MEMORY;
+PRAGMA query_only=1;
+"""
+
 def connect_sqlite() -> sqlite3.Connection:
     p = Path(SQLITE_PATH)
     p.parent.mkdir(parents=True, exist_ok=True)
     conn = sqlite3.connect(str(p))
     conn.row_factory = sqlite3.Row
+    conn.executescript(_RW_PRAGMAS)
+    return conn
+
+def connect_sqlite_ro() -> sqlite3.Connection:
+    # mode=ro: the file must already exist (init_schema on a writer first)
+    p = Path(SQLITE_PATH).resolve()
+    conn = sqlite3.connect(f"{p.as_uri()}?mode=ro&cache=shared", uri=True)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_RO_PRAGMAS)
     return conn
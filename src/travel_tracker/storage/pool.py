@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from travel_tracker.storage.db import SQLITE_PATH
+
+POOL_SIZE = 8
+
+# pooled connections are read-only: mmap the file (reads become memcpy from the
+# OS page cache), 64 MiB page cache, and refuse writes.
+# no journal_mode here: setting it writes the db header; the writer side owns it
+_READ_PRAGMAS = """
+PRAGMA temp_store=memory;
+PRAGMA mmap_size=268435456;
+PRAGMA cache_size=-65536;
+PRAGMA query_only=1;
+"""
+
+_WRITE_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=normal;
+PRAGMA temp_store=memory;
+"""
+
+
+def _open(path: str) -> sqlite3.Connection:
+    c = sqlite3.connect(path, check_same_thread=False)
+    c.row_factory = sqlite3.Row
+    c.executescript(_READ_PRAGMAS)
+    return c
+
+
+def open_writer(path: str | Path = SQLITE_PATH) -> sqlite3.Connection:
+    """Unpooled read-write connection (pool connections are query_only). Caller closes it."""
+    c = sqlite3.connect(str(path))
+    c.executescript(_WRITE_PRAGMAS)
+    return c
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of pre-opened, read-only SQLite connections (used by the API).
+    - connections are opened lazily (up to `size`), then reused forever
+    - LIFO: the most recently used connection (warm page cache) goes out first
+    """
+    def __init__(self, path: str | Path = SQLITE_PATH, size: int = POOL_SIZE) -> None:
+        self.path = str(path)
+        self.size = size
+        self._q: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue(maxsize=size)
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._q.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                c = _open(self.path)
+                self._created += 1
+                return c
+        return self._q.get()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        c = self._acquire()
+        try:
+            yield c
+        finally:
+            if c.in_transaction:
+                c.rollback()
+            self._q.put(c)
+
+    def close_all(self) -> None:
+        with self._lock:
+            while True:
+                try:
+                    self._q.get_nowait().close()
+                except queue.Empty:
+                    break
+                self._created -= 1
+
+
+_pool = ConnectionPool()
+
+
+@contextmanager
+def get_conn() -> Iterator[sqlite3.Connection]:
+    with _pool.connection() as c:
+        yield c
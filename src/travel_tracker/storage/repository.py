@@ -2,10 +2,9 @@ from __future__ import annotations
 
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Sequence
 
-from travel_tracker.storage.db import connect_sqlite
-import sqlite3
+from travel_tracker.storage.db import connect_sqlite, connect_sqlite_ro
 
 def _now_iso() -> str:
     return datetime.now().isoformat(timespec="seconds")
@@ -25,10 +24,53 @@ CREATE TABLE IF NOT EXISTS news_items (
 );
 """.strip()
 
+# news_items(city, topic, newest first): the biweekly top-N window walks this index instead of sorting.
+# signals_news(run_date, city_code) already comes from db_init.sql (idx_news_date_city).
+NEWS_INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_news_city_topic_date
+  ON news_items(city, topic, COALESCE(published_at, fetched_at) DESC);
+""".strip()
+
+
+# one quote per (run_date, provider, origin, destination, route_id): a rerun replaces the day's row
+FLIGHTS_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS flights_quotes (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  run_date TEXT NOT NULL,
+  provider TEXT NOT NULL,
+  origin TEXT NOT NULL,
+  destination TEXT NOT NULL,
+  route_id TEXT NOT NULL,
+  source_url TEXT NOT NULL,
+  status_code INTEGER,
+  parse_ok INTEGER NOT NULL DEFAULT 0,
+  min_price_value REAL,
+  min_price_currency TEXT,
+  notes TEXT,
+  raw_path TEXT,
+  created_at TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_flights_quotes_dedup
+  ON flights_quotes(run_date, provider, origin, destination, route_id);
+""".strip()
+
+
+SIGNAL_TABLES = ("signals_news", "signals_weather", "signals_safety")
+
+# one row per (run_date, city, title, url) -> duplicates are dropped by INSERT OR IGNORE at insert time
+SIGNAL_DEDUP_KEY = "run_date, city_code, LOWER(title), LOWER(url)"
+
 
 class Repository:
-    def __init__(self) -> None:
-        self.conn = connect_sqlite()
+    def __init__(self, mode: str = "rw") -> None:
+        # mode="ro": read-only URI connection with reader PRAGMAs (report pipelines)
+        if mode not in ("rw", "ro"):
+            raise ValueError("mode must be 'rw' or 'ro'")
+        self.conn = connect_sqlite_ro() if mode == "ro" else connect_sqlite()
+        # table -> column names (PRAGMA table_info once per table)
+        self._cols_cache: dict[str, set[str]] = {}
+        # (verb, table, row keys) -> prepared INSERT plan, see _insert_plan
+        self._insert_sql_cache: dict[tuple[str, str, tuple[str, ...]], tuple[str, tuple[str, ...], bool]] = {}
 
     def commit(self) -> None:
         self.conn.commit()
@@ -39,29 +81,52 @@ class Repository:
     def close(self) -> None:
         self.conn.close()
 
-        self._cols_cache: dict[str, set[str]] = {}
-
-    def close(self) -> None:
-        self.conn.close()
+    def _index_names(self) -> set[str]:
+        return {r[0] for r in self.conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
 
     def init_schema(self) -> None:
+        indexes_before = self._index_names()
+
         # Base schema from SQL file
         sql = Path("scripts/db_init.sql").read_text(encoding="utf-8")
         self.conn.executescript(sql)
 
         # News table (ours)
         self.conn.execute(f'''{NEWS_SCHEMA_SQL}''')
+        self.conn.executescript(NEWS_INDEX_SQL)
+
+        # Flights quotes (flights_snapshot -> flights_summary)
+        self.conn.executescript(FLIGHTS_SCHEMA_SQL)
+
+        self._ensure_signal_dedup_indexes()
 
         self.conn.commit()
 
+        # refresh sqlite_stat1 so the planner picks the composite indexes; only when an
+        # index was just created (a full stats scan on every cron run is wasted work)
+        if self._index_names() - indexes_before:
+            self.conn.execute("ANALYZE")
+
+    def _ensure_signal_dedup_indexes(self) -> None:
+        existing = self._index_names()
+        for t in SIGNAL_TABLES:
+            name = f"uniq_{t}"
+            if name in existing:
+                continue
+            # first time only: older DBs may already hold duplicates -> keep the earliest row
+            self.conn.execute(
+                f"DELETE FROM {t} WHERE id NOT IN (SELECT MIN(id) FROM {t} GROUP BY {SIGNAL_DEDUP_KEY})"
+            )
+            self.conn.execute(f"CREATE UNIQUE INDEX {name} ON {t}({SIGNAL_DEDUP_KEY})")
+
     def _table_cols(self, table: str) -> set[str]:
-        if not hasattr(self, "_cols_cache"):
-            self._cols_cache = {}
         if table in self._cols_cache:
             return self._cols_cache[table]
         rows = self.conn.execute(f"PRAGMA table_info({table});").fetchall()
         cols = {r[1] for r in rows}  # r[1] = column name
-        self._cols_cache[table] = cols
+        if cols:
+            # a missing table is not cached: init_schema may create it later
+            self._cols_cache[table] = cols
         return cols
 
     # ---------- runs ----------
@@ -87,26 +152,55 @@ class Repository:
         self.conn.commit()
 
     # ---------- generic insert helper ----------
+    def _insert_plan(self, verb: str, table: str, keys: tuple[str, ...]) -> tuple[str, tuple[str, ...], bool]:
+        """
+        (sql, data columns in bind order, append created_at?) for rows with these keys.
+        Built once per (verb, table, keys): the hot loops only bind values.
+        Raises ValueError when the table does not exist or no key is one of its
+        columns (nothing would be written).
+        """
+        ck = (verb, table, keys)
+        plan = self._insert_sql_cache.get(ck)
+        if plan is None:
+            cols = self._table_cols(table)
+            if not cols:
+                raise ValueError(f"table not found: {table} (run init_schema first)")
+            use_cols = tuple(k for k in keys if k in cols)
+            if not use_cols:
+                raise ValueError(f"no columns of {table} in row keys: {', '.join(keys)}")
+            add_created = "created_at" in cols and "created_at" not in use_cols
+            col_names = use_cols + (("created_at",) if add_created else ())
+            sql = f"{verb} INTO {table}({','.join(col_names)}) VALUES ({','.join('?' * len(col_names))})"
+            plan = self._insert_sql_cache[ck] = (sql, use_cols, add_created)
+        return plan
+
     def _insert_row_ignore(self, table: str, data: dict[str, Any]) -> None:
-        cols = self._table_cols(table)
-        col_names: list[str] = []
-        values: list[Any] = []
-        for k, v in data.items():
-            if k in cols:
-                col_names.append(k)
-                values.append(v)
-        if "created_at" in cols and "created_at" not in col_names:
-            col_names.append("created_at")
-            values.append(_now_iso())
-
-        if not col_names:
-            return
-
-        placeholders = ",".join(["?"] * len(values))
-        sql = f"INSERT OR IGNORE INTO {table}({','.join(col_names)}) VALUES ({placeholders})"
-        self.conn.execute(sql, tuple(values))
+        sql, use_cols, add_created = self._insert_plan("INSERT OR IGNORE", table, tuple(data))
+        extra = (_now_iso(),) if add_created else ()
+        self.conn.execute(sql, (*(data[c] for c in use_cols), *extra))
         self.conn.commit()
 
+    def insert_many(self, table: str, rows: Iterable[dict[str, Any]], *, replace: bool = False) -> int:
+        """
+        Bulk version of _insert_row_ignore.
+        - columns resolved once: keys of the first row that exist in the table (+ created_at)
+        - one prepared statement + executemany, committed as a single transaction
+        - replace=True: INSERT OR REPLACE (rerun refreshes rows on the UNIQUE key)
+        - unknown table / no matching columns: ValueError (see _insert_plan)
+        - returns the number of rows written
+        """
+        rows = list(rows)
+        if not rows:
+            return 0
+
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        sql, use_cols, add_created = self._insert_plan(verb, table, tuple(rows[0]))
+        extra = (_now_iso(),) if add_created else ()
+
+        with self.conn:
+            cur = self.conn.executemany(sql, [(*(r.get(c) for c in use_cols), *extra) for r in rows])
+        return max(cur.rowcount, 0)
+
     # ---------- signals ----------
     def insert_signal(
         self,
@@ -142,95 +236,30 @@ class Repository:
 
         self._insert_row_ignore(table, data)
 
-    # ---------- news ----------
-    def insert_news_item(
-        self,
-        *,
-        city: str,
-        topic: str,
-        source: str,
-        title: str,
-        url: str,
-        published_at: str | None,
-    ) -> bool:
-        fetched_at = datetime.utcnow().isoformat(timespec="seconds")
-        sql = """
-        INSERT OR IGNORE INTO news_items
-        (city, topic, source, title, url, published_at, fetched_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
+    def insert_signals_many(self, table: str, rows: Iterable[Sequence[Any]]) -> int:
         """
-        cur = self.conn.execute(sql, (city, topic, source, title, url, published_at, fetched_at))
-        self.conn.commit()
-        try:
-            return cur.rowcount == 1
-        except Exception:
-            return True
-
-    def list_news(
-        self,
-        *,
-        start_date: str,  # YYYY-MM-DD
-        end_date: str,    # YYYY-MM-DD
-        city: str | None = None,
-        topic: str | None = None,
-        limit: int = 50,
-    ) -> list[dict]:
-        where = []
-        params: list[Any] = []
-
-        where.append("SUBSTR(COALESCE(published_at, fetched_at), 1, 10) >= ?")
-        where.append("SUBSTR(COALESCE(published_at, fetched_at), 1, 10) <= ?")
-        params.extend([start_date, end_date])
-
-        if city:
-            where.append("city = ?")
-            params.append(city)
-        if topic:
-            where.append("topic = ?")
-            params.append(topic)
-
-        sql = f"""
-        SELECT city, topic, source, title, url, published_at, fetched_at
-        FROM news_items
-        WHERE {' AND '.join(where)}
-        ORDER BY COALESCE(published_at, fetched_at) DESC
-        LIMIT ?
-        """
-        params.append(limit)
-
-        cur = self.conn.execute(sql, params)
-        rows = cur.fetchall()
-        return [
-            {
-                "city": r[0],
-                "topic": r[1],
-                "source": r[2],
-                "title": r[3],
-                "url": r[4],
-                "published_at": r[5],
-                "fetched_at": r[6],
-            }
-            for r in rows
-        ]
-    def insert_signal(self, table: str, row: dict) -> bool:
+        Bulk INSERT OR IGNORE into signals_*.
+        - rows: (run_date, city_code, city_name_zh, source_id, title, url, published_at)
+        - one prepared statement + executemany, committed as a single transaction
+        - returns the number of rows actually inserted
         """
-        通用寫入 signals_* 表。
-        - 只寫入表中存在的欄位（用 PRAGMA table_info）
-        - 若因 UNIQUE 衝突導致 IntegrityError，回傳 False（視為已存在）
-        """
-        cols = self._table_cols(table)
-        use_cols = [c for c in cols if c in row and row[c] is not None]
-
-        if not use_cols:
-            return False
-
-        sql = f"INSERT INTO {table} ({','.join(use_cols)}) VALUES ({','.join(['?']*len(use_cols))})"
-        vals = [row[c] for c in use_cols]
+        if table not in {"signals_news", "signals_weather", "signals_safety"}:
+            raise ValueError("Invalid table")
 
-        try:
-            self.conn.execute(sql, vals)
-            self.conn.commit()
-            return True
-        except sqlite3.IntegrityError:
-            self.conn.rollback()
-            return False
\ No newline at end of file
+        cols = self._table_cols(table)
+        # source_id goes to `source` (old schema) and/or `source_id` (newer schema)
+        src_cols = [c for c in ("source", "source_id") if c in cols]
+        tail = ("created_at",) if "created_at" in cols else ()
+        col_names = ["run_date", "city_code", "city_name_zh", "title", "url", "published_at", *src_cols, *tail]
+        sql = f"INSERT OR IGNORE INTO {table}({','.join(col_names)}) VALUES ({','.join(['?'] * len(col_names))})"
+
+        n_src = len(src_cols)
+        extra = (_now_iso(),) if tail else ()
+
+        def _values(r: Sequence[Any]) -> tuple:
+            run_date, city_code, city_name_zh, source_id, title, url, published_at = r
+            return (run_date, city_code, city_name_zh, title, url, published_at, *((source_id,) * n_src), *extra)
+
+        with self.conn:
+            cur = self.conn.executemany(sql, map(_values, rows))
+        return max(cur.rowcount, 0)